@@ -18,6 +18,7 @@ import csv
 import json
 import re
 import argparse
+import functools
 import warnings
 from datetime import datetime
 from io import BytesIO, StringIO
@@ -25,12 +26,18 @@ import base64
 
 import numpy as np
 from scipy import signal
-from scipy.fft import rfft, rfftfreq
+from scipy.fft import next_fast_len, rfft, rfftfreq
 
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# orjson is an optional speedup (pip install inav-toolkit[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 warnings.filterwarnings("ignore", message=".*tight_layout.*")
 
@@ -258,9 +265,12 @@ def _nearest_key(size_map, inches):
     return key
 
 
+@functools.lru_cache(maxsize=32)
 def get_frame_profile(frame_inches=None, prop_inches=None, n_blades=3):
     """Build a complete profile by merging frame response thresholds with prop noise config.
 
+    Cached per argument set - the returned dict is shared, do not mutate it.
+
     Args:
         frame_inches: Frame size (determines PID thresholds). Default: 5.
         prop_inches: Prop diameter (determines filter ranges). Default: same as frame.
@@ -365,10 +375,14 @@ def estimate_prop_harmonics(rpm_range, n_blades=2):
     return harmonics
 
 
+@functools.lru_cache(maxsize=4096)
 def _phase_shift(filter_type, freq_hz, cutoff_hz, q=None):
     """
     Compute phase lag (degrees) for a given filter at a specific frequency.
 
+    Memoized: the filter chain is evaluated at the same few frequencies
+    many times per analysis.
+
     Parameters
     ----------
     filter_type : str
@@ -1679,7 +1693,7 @@ class BlackboxDecoder:
 
         if header_rate and header_rate > 10:
             data["sample_rate"] = header_rate
-            data["time_s"] = np.arange(n_rows) / header_rate
+            data["time_s"] = _sample_times(n_rows, header_rate)
         elif "time" in data:
             time_us = data["time"]
             valid_time = time_us[~np.isnan(time_us)]
@@ -1688,16 +1702,16 @@ class BlackboxDecoder:
                 good_diffs = diffs[(diffs > 0) & (diffs < 1e7)]
                 if len(good_diffs) > 10:
                     data["sample_rate"] = float(1e6 / np.median(good_diffs))
-                    data["time_s"] = np.arange(n_rows) / data["sample_rate"]
+                    data["time_s"] = _sample_times(n_rows, data["sample_rate"])
                 else:
                     data["sample_rate"] = 1000.0
-                    data["time_s"] = np.arange(n_rows) / 1000.0
+                    data["time_s"] = _sample_times(n_rows, 1000.0)
             else:
                 data["sample_rate"] = 1000.0
-                data["time_s"] = np.arange(n_rows) / 1000.0
+                data["time_s"] = _sample_times(n_rows, 1000.0)
         else:
             data["sample_rate"] = 1000.0
-            data["time_s"] = np.arange(n_rows) / 1000.0
+            data["time_s"] = _sample_times(n_rows, 1000.0)
 
         data["headers"] = field_names
         data["n_rows"] = n_rows
@@ -1756,6 +1770,13 @@ def flexible_col_match(headers, patterns):
     return None
 
 
+def _sample_times(n, sr):
+    """Sample timestamps in seconds: arange(n) / sr, divided in place."""
+    time_s = np.arange(n, dtype=np.float64)
+    time_s /= sr
+    return time_s
+
+
 def parse_csv_log(csv_path):
     with open(csv_path, "r", errors="ignore") as f:
         lines = [l.strip() for l in f if l.strip() and not l.strip().startswith(("#", "H "))]
@@ -1823,8 +1844,9 @@ def parse_csv_log(csv_path):
             found[key] = idx
 
     n_rows = len(rows)
-    for key, idx in found.items():
-        arr = np.zeros(n_rows, dtype=np.float64)
+    # One block for all channels; each data[key] is a contiguous row view
+    block = np.zeros((len(found), n_rows), dtype=np.float64)
+    for arr, (key, idx) in zip(block, found.items()):
         for i, row in enumerate(rows):
             if idx < len(row):
                 try:
@@ -1839,13 +1861,15 @@ def parse_csv_log(csv_path):
         valid = valid[valid > 0]
         if len(valid) > 10:
             data["sample_rate"] = 1e6 / np.median(valid)
-            data["time_s"] = (time_us - time_us[0]) / 1e6
+            time_s = time_us - time_us[0]
+            time_s /= 1e6
+            data["time_s"] = time_s
         else:
             data["sample_rate"] = 1000.0
-            data["time_s"] = np.arange(n_rows) / 1000.0
+            data["time_s"] = _sample_times(n_rows, 1000.0)
     else:
         data["sample_rate"] = 1000.0
-        data["time_s"] = np.arange(n_rows) / 1000.0
+        data["time_s"] = _sample_times(n_rows, 1000.0)
 
     data["headers"] = headers
     data["n_rows"] = n_rows
@@ -2069,13 +2093,28 @@ def print_log_quality(quality, verbose=False):
 
 # ─── Signal Analysis ──────────────────────────────────────────────────────────
 
+def _psd_nperseg(n, nperseg=None):
+    if nperseg is None:
+        nperseg = min(4096, n // 4)
+    return max(256, min(nperseg, n // 2))
+
+
+def _power_db(psd):
+    """10*log10(psd + 1e-20), computed in psd's own buffer."""
+    psd += 1e-20
+    np.log10(psd, out=psd)
+    psd *= 10
+    return psd
+
+
 def compute_psd(arr, sr, nperseg=None):
     clean = arr[~np.isnan(arr)]
-    if nperseg is None:
-        nperseg = min(4096, len(clean) // 4)
-    nperseg = max(256, min(nperseg, len(clean) // 2))
-    freqs, psd = signal.welch(clean, fs=sr, nperseg=nperseg, window="hann", scaling="density")
-    return freqs, 10 * np.log10(psd + 1e-20)
+    nperseg = _psd_nperseg(len(clean), nperseg)
+    # Zero-pad each segment to an FFT size with only small prime factors:
+    # a large one makes pocketfft fall back to Bluestein's algorithm
+    freqs, psd = signal.welch(clean, fs=sr, nperseg=nperseg, nfft=next_fast_len(nperseg),
+                              window="hann", scaling="density")
+    return freqs, _power_db(psd)
 
 
 def find_noise_peaks(freqs, psd_db, n_peaks=5, min_height_db=-30, min_prominence=6):
@@ -2094,6 +2133,46 @@ def analyze_noise(data, axis_name, gyro_key, sr):
     if gyro_key not in data:
         return None
     freqs, psd_db = compute_psd(data[gyro_key], sr)
+    return _noise_summary(axis_name, freqs, psd_db, sr)
+
+
+def analyze_noise_axes(data, axes, sr):
+    """analyze_noise() for each (axis_name, gyro_key) pair in axes.
+
+    When every present axis has the same NaN-free length (the usual case)
+    their PSDs come from one 2-D Welch call instead of one per axis.
+    """
+    cleans = {}
+    for _, key in axes:
+        if key in data:
+            arr = data[key]
+            cleans[key] = arr[~np.isnan(arr)]
+    batch = _batched_psd(cleans, sr)
+    if batch is None:
+        return [analyze_noise(data, ax, key, sr) for ax, key in axes]
+
+    freqs, psd_db = batch
+    return [_noise_summary(ax, freqs, psd_db[key], sr) if key in psd_db else None
+            for ax, key in axes]
+
+
+def _batched_psd(cleans, sr):
+    """compute_psd() of every array in cleans with one 2-D Welch call.
+
+    Returns (freqs, {key: psd_db}) sharing one frequency table, or None
+    when there are fewer than two arrays or their lengths differ.
+    """
+    lengths = {len(c) for c in cleans.values()}
+    if len(cleans) < 2 or len(lengths) != 1:
+        return None
+    nperseg = _psd_nperseg(lengths.pop())
+    freqs, psd = signal.welch(np.stack(list(cleans.values())), fs=sr,
+                              nperseg=nperseg, nfft=next_fast_len(nperseg),
+                              window="hann", scaling="density", axis=-1)
+    return freqs, dict(zip(cleans, _power_db(psd)))
+
+
+def _noise_summary(axis_name, freqs, psd_db, sr):
     peaks = find_noise_peaks(freqs, psd_db)
     low_band = psd_db[(freqs >= 10) & (freqs < 100)]
     mid_band = psd_db[(freqs >= 100) & (freqs < 300)]
@@ -2555,10 +2634,8 @@ def measure_tracking_delay_xcorr(sp, gy, sr, max_delay_ms=200):
         return None
 
     # Normalize for correlation
-    sp_sig = sp_hp.copy()
-    gy_sig = gy_hp.copy()
-    sp_sig -= np.mean(sp_sig)
-    gy_sig -= np.mean(gy_sig)
+    sp_sig = sp_hp - np.mean(sp_hp)
+    gy_sig = gy_hp - np.mean(gy_hp)
     sp_std = np.std(sp_sig)
     gy_std = np.std(gy_sig)
     if sp_std < 1e-6 or gy_std < 1e-6:
@@ -2643,8 +2720,8 @@ def detect_hover_oscillation(data, sr, profile=None):
         if sp_key not in data or gy_key not in data:
             continue
 
-        sp = data[sp_key].copy()
-        gy = data[gy_key].copy()
+        sp = data[sp_key]
+        gy = data[gy_key]
         mask = ~(np.isnan(sp) | np.isnan(gy))
         sp, gy = sp[mask], gy[mask]
         if len(sp) < min_hover_samples:
@@ -2764,7 +2841,7 @@ def analyze_pid_response(data, axis_idx, sr):
     sp_key, gyro_key = f"setpoint_{axis.lower()}", f"gyro_{axis.lower()}"
     if sp_key not in data or gyro_key not in data:
         return None
-    sp, gy = data[sp_key].copy(), data[gyro_key].copy()
+    sp, gy = data[sp_key], data[gyro_key]
     mask = ~(np.isnan(sp) | np.isnan(gy))
     sp, gy = sp[mask], gy[mask]
     if len(sp) < 100:
@@ -2896,15 +2973,22 @@ def analyze_motors(data, sr, config=None):
 
 
 def analyze_dterm_noise(data, sr):
-    results = []
+    cleans = {}
     for axis in AXIS_NAMES:
         d_key = f"axisD_{axis.lower()}"
         if d_key not in data:
             continue
         clean = data[d_key][~np.isnan(data[d_key])]
-        if len(clean) < 256:
-            continue
-        freqs, psd_db = compute_psd(clean, sr)
+        if len(clean) >= 256:
+            cleans[axis] = clean
+    batch = _batched_psd(cleans, sr)
+
+    results = []
+    for axis, clean in cleans.items():
+        if batch is not None:
+            freqs, psd_db = batch[0], batch[1][axis]
+        else:
+            freqs, psd_db = compute_psd(clean, sr)
         peaks = find_noise_peaks(freqs, psd_db, min_height_db=-40)
         results.append({"axis": axis, "freqs": freqs, "psd_db": psd_db,
                          "peaks": peaks, "rms": float(np.sqrt(np.mean(clean**2)))})
@@ -4227,16 +4311,14 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
 
     # ═══ 1. DECELERATION OVERSHOOT ═══
     if has_tgt_vel and has_tgt:
-        tgt_vel_n = data["nav_tgt_vel_n"].copy()
-        tgt_vel_e = data["nav_tgt_vel_e"].copy()
-        pos_n = data["nav_pos_n"].copy()
-        pos_e = data["nav_pos_e"].copy()
-        tgt_n = data["nav_tgt_n"].copy()
-        tgt_e = data["nav_tgt_e"].copy()
+        pos_n = data["nav_pos_n"]
+        pos_e = data["nav_pos_e"]
+        tgt_n = data["nav_tgt_n"]
+        tgt_e = data["nav_tgt_e"]
 
         # Replace NaN with 0 for velocity
-        tgt_vel_n = np.nan_to_num(tgt_vel_n, 0)
-        tgt_vel_e = np.nan_to_num(tgt_vel_e, 0)
+        tgt_vel_n = np.nan_to_num(data["nav_tgt_vel_n"], nan=0.0)
+        tgt_vel_e = np.nan_to_num(data["nav_tgt_vel_e"], nan=0.0)
 
         tgt_speed = np.sqrt(tgt_vel_n**2 + tgt_vel_e**2)  # cm/s
 
@@ -4360,10 +4442,10 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
 
     # ═══ 2. POSITION HOLD QUALITY ═══
     if has_tgt and np.any(poshold_mask):
-        pos_n = data["nav_pos_n"].copy()
-        pos_e = data["nav_pos_e"].copy()
-        tgt_n = data["nav_tgt_n"].copy()
-        tgt_e = data["nav_tgt_e"].copy()
+        pos_n = data["nav_pos_n"]
+        pos_e = data["nav_pos_e"]
+        tgt_n = data["nav_tgt_n"]
+        tgt_e = data["nav_tgt_e"]
 
         # Isolate poshold segments
         ph_pos_n = pos_n[poshold_mask]
@@ -4388,7 +4470,7 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
             toilet_bowl = False
             tb_period = None
             if len(err_n) > sr * 3:
-                from scipy.fft import rfft, rfftfreq
+                from scipy.fft import next_fast_len, rfft, rfftfreq
                 freqs_n = rfftfreq(len(err_n), 1.0 / sr)
                 spec_n = np.abs(rfft(err_n - np.mean(err_n)))
                 spec_e = np.abs(rfft(err_e - np.mean(err_e)))
@@ -4464,8 +4546,8 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
 
     # ═══ 3. ALTITUDE HOLD QUALITY ═══
     if "nav_pos_u" in data and "nav_tgt_u" in data and np.any(althold_mask):
-        pos_z = data["nav_pos_u"].copy()
-        tgt_z = data["nav_tgt_u"].copy()
+        pos_z = data["nav_pos_u"]
+        tgt_z = data["nav_tgt_u"]
 
         ah_pos_z = pos_z[althold_mask]
         ah_tgt_z = tgt_z[althold_mask]
@@ -4481,7 +4563,7 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
             z_osc = False
             z_osc_freq = None
             if len(err_z) > sr * 2:
-                from scipy.fft import rfft, rfftfreq
+                from scipy.fft import next_fast_len, rfft, rfftfreq
                 freqs = rfftfreq(len(err_z), 1.0 / sr)
                 spec = np.abs(rfft(err_z - np.mean(err_z)))
                 band = (freqs >= 0.1) & (freqs <= 5.0)
@@ -4576,10 +4658,10 @@ def analyze_nav_performance(data, sr, config=None, profile=None):
             wind_n = np.array([w[1] for w in wind_data])
             wind_e = np.array([w[2] for w in wind_data])
 
-            pos_n = data["nav_pos_n"].copy()
-            pos_e = data["nav_pos_e"].copy()
-            tgt_n = data["nav_tgt_n"].copy()
-            tgt_e = data["nav_tgt_e"].copy()
+            pos_n = data["nav_pos_n"]
+            pos_e = data["nav_pos_e"]
+            tgt_n = data["nav_tgt_n"]
+            tgt_e = data["nav_tgt_e"]
 
             # Simple: correlate wind speed with position error magnitude during poshold
             ph_indices = np.where(poshold_mask)[0]
@@ -5909,7 +5991,7 @@ def analyze_propwash(data, sr, profile=None):
                 continue
 
             # FFT to find propwash frequency
-            from scipy.fft import rfft, rfftfreq
+            from scipy.fft import next_fast_len, rfft, rfftfreq
             freqs = rfftfreq(len(clean), 1.0 / sr)
             spec = np.abs(rfft(clean - np.mean(clean)))
             # Propwash is typically 20-80Hz
@@ -5983,8 +6065,8 @@ def fig_to_base64(fig, dpi=120):
     buf = BytesIO()
     fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor(), edgecolor="none")
     plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("ascii")
+    # Encode straight from the buffer instead of copying the PNG out first
+    return base64.b64encode(buf.getbuffer()).decode("ascii")
 
 def setup_dark_style():
     plt.rcParams.update({
@@ -10145,7 +10227,7 @@ def _post_analysis_cleanup(blackbox_dir, raw_download, split_files, analyzed_fil
 
 # ─── Main ─────────────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="INAV Blackbox Analyzer v2.23.0 - Prescriptive Tuning",
                                       formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--version", action="version", version=f"inav-analyze {REPORT_VERSION}")
@@ -10246,7 +10328,7 @@ def main():
     parser.add_argument("--lang", metavar="LANG",
                         help="Language for output (en, pt_BR, es). "
                              "Auto-detects from INAV_LANG env var or system locale.")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Initialize localization
     try:
@@ -11178,7 +11260,7 @@ def _analyze_for_compare(logfile, args, config_raw=None):
 
     # Run all analyses
     hover_osc = detect_hover_oscillation(data, sr, profile)
-    noise_results = [analyze_noise(data, ax, f"gyro_{ax.lower()}", sr) for ax in AXIS_NAMES]
+    noise_results = analyze_noise_axes(data, [(ax, f"gyro_{ax.lower()}") for ax in AXIS_NAMES], sr)
     pid_results = [analyze_pid_response(data, i, sr) for i in range(3)]
     motor_analysis = analyze_motors(data, sr, config)
     dterm_results = analyze_dterm_noise(data, sr)
@@ -11434,6 +11516,49 @@ footer{{text-align:center;color:var(--dm);font-size:.7rem;padding:24px 0;border-
 </div><footer>INAV Blackbox Analyzer v{REPORT_VERSION} - Comparison Report</footer></body></html>"""
 
 
+def _analyze_pair(file_a, file_b, args, config_raw):
+    """_analyze_for_compare() on both logs; returns (res_a, res_b).
+
+    The two pipelines are independent: B is analyzed in a worker process
+    while A runs here, and the worker gets the report language up front.
+    Where no worker can be started (restricted sandboxes without process
+    or semaphore support) or it dies, B runs here afterwards.
+    """
+    import concurrent.futures
+    try:
+        from inav_toolkit.i18n import get_locale, set_locale
+    except ImportError:
+        from i18n import get_locale, set_locale
+
+    pool = future_b = None
+    try:
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, initializer=set_locale, initargs=(get_locale(),))
+        future_b = pool.submit(_analyze_for_compare, file_b, args, config_raw)
+    except (OSError, NotImplementedError, RuntimeError):
+        pass
+
+    try:
+        print(f"  Analyzing flight A...", end=" ", flush=True)
+        res_a = _analyze_for_compare(file_a, args, config_raw)
+        print(f"score {res_a['plan']['scores']['overall']:.0f}/100")
+
+        print(f"  Analyzing flight B...", end=" ", flush=True)
+        res_b = None
+        if future_b is not None:
+            try:
+                res_b = future_b.result()
+            except concurrent.futures.process.BrokenProcessPool:
+                pass
+        if res_b is None:
+            res_b = _analyze_for_compare(file_b, args, config_raw)
+        print(f"score {res_b['plan']['scores']['overall']:.0f}/100")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return res_a, res_b
+
+
 def _run_comparison(file_a, file_b, args, config_raw):
     """Run comparative analysis on two flight logs."""
     R, B, C, G, Y, RED, DIM = _colors()
@@ -11443,15 +11568,9 @@ def _run_comparison(file_a, file_b, args, config_raw):
     print(f"  Flight B: {file_b}")
     print()
 
-    print(f"  Analyzing flight A...", end=" ", flush=True)
-    res_a = _analyze_for_compare(file_a, args, config_raw)
+    res_a, res_b = _analyze_pair(file_a, file_b, args, config_raw)
     sa = res_a["plan"]["scores"]
-    print(f"score {sa['overall']:.0f}/100")
-
-    print(f"  Analyzing flight B...", end=" ", flush=True)
-    res_b = _analyze_for_compare(file_b, args, config_raw)
     sb = res_b["plan"]["scores"]
-    print(f"score {sb['overall']:.0f}/100")
 
     label_a = os.path.splitext(os.path.basename(file_a))[0]
     label_b = os.path.splitext(os.path.basename(file_b))[0]
@@ -11561,12 +11680,64 @@ def _run_comparison(file_a, file_b, args, config_raw):
 
 # ─── Replay Mode ─────────────────────────────────────────────────────────────
 
-def _downsample(arr, target_points=5000):
-    """Downsample array to target number of points using decimation."""
-    if len(arr) <= target_points:
-        return arr.tolist() if hasattr(arr, 'tolist') else list(arr)
-    step = max(1, len(arr) // target_points)
-    return arr[::step].tolist() if hasattr(arr, 'tolist') else list(arr[::step])
+@functools.lru_cache(maxsize=8)
+def _downsample_index(n, target_points):
+    """Evenly spaced sample indices, first and last included (shared, read-only)."""
+    idx = np.linspace(0, n - 1, target_points).astype(np.intp)
+    idx.flags.writeable = False
+    return idx
+
+
+def _downsample(arr, target_points=5000, decimals=None):
+    """Downsample array to exactly target_points evenly spaced samples.
+
+    Channels of the same length share one cached index array, so the
+    replay series stay aligned with the downsampled time axis. With
+    decimals, values are rounded first, which keeps the JSON short.
+    """
+    if len(arr) > target_points:
+        arr = np.asarray(arr).take(_downsample_index(len(arr), target_points))
+    if decimals is not None:
+        arr = np.round(arr, decimals)
+    return arr.tolist() if hasattr(arr, 'tolist') else list(arr)
+
+
+def _finite_or_none(obj):
+    """Copy of a JSON-ready structure with NaN/inf floats replaced by None."""
+    if isinstance(obj, float):
+        return obj if np.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite_or_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(v) for v in obj]
+    return obj
+
+
+def _compact_json(obj):
+    """json.dumps() without whitespace, done in C by orjson when installed.
+
+    NaN and inf become null on both paths, as orjson writes them.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    try:
+        return json.dumps(obj, separators=(',', ':'), allow_nan=False)
+    except ValueError:
+        return json.dumps(_finite_or_none(obj), separators=(',', ':'))
+
+
+@functools.lru_cache(maxsize=8)
+def _spectrogram_basis(nperseg, sr):
+    """Hann window and kept (<= 500 Hz) rFFT bins for one segment length.
+
+    Cached per (nperseg, sr); the arrays are shared and read-only.
+    """
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / sr)
+    freqs = freqs[freqs <= 500]
+    window = np.hanning(nperseg)
+    freqs.flags.writeable = False
+    window.flags.writeable = False
+    return window, freqs
 
 
 def _compute_spectrogram(gyro, sr, nperseg=256, noverlap=None):
@@ -11586,28 +11757,49 @@ def _compute_spectrogram(gyro, sr, nperseg=256, noverlap=None):
         step = max(1, (len(gyro) - nperseg) // max_segments)
         n_segments = min(max_segments, (len(gyro) - nperseg) // step + 1)
 
-    freqs = np.fft.rfftfreq(nperseg, 1.0 / sr)
-    # Only keep up to 500Hz
-    freq_mask = freqs <= 500
-    freqs = freqs[freq_mask]
-
-    window = np.hanning(nperseg)
+    window, freqs = _spectrogram_basis(nperseg, float(sr))
     power = np.zeros((len(freqs), n_segments))
     times = np.zeros(n_segments)
 
-    for i in range(n_segments):
-        start = i * step
-        end = start + nperseg
-        if end > len(gyro):
-            break
-        segment = gyro[start:end] * window
-        fft_vals = np.fft.rfft(segment)
-        psd = np.abs(fft_vals[:len(freqs)]) ** 2
-        psd[psd < 1e-12] = 1e-12
-        power[:, i] = 10 * np.log10(psd)
-        times[i] = (start + nperseg / 2) / sr
+    # All full-length segments as rows of one array, transformed in one call
+    starts = np.arange(n_segments) * step
+    starts = starts[starts + nperseg <= len(gyro)]
+    if len(starts):
+        frames = np.lib.stride_tricks.sliding_window_view(
+            np.asarray(gyro, dtype=float), nperseg)[starts]
+        spec = np.fft.rfft(frames * window, axis=1)[:, :len(freqs)]
+        psd = spec.real ** 2 + spec.imag ** 2
+        np.maximum(psd, 1e-12, out=psd)
+        np.log10(psd, out=psd)
+        psd *= 10
+        power[:, :len(starts)] = psd.T
+        times[:len(starts)] = (starts + nperseg / 2) / sr
+
+    # 0.1 dB is finer than the heatmap's colour scale resolves
+    return times.tolist(), freqs.tolist(), np.round(power, 1).tolist()
+
+
+# INAV flight mode IDs (from src/main/fc/runtime_config.h)
+_FLIGHT_MODE_NAMES = {
+    0: "ARM", 1: "ANGLE", 2: "HORIZON", 3: "NAV ALTHOLD",
+    4: "HEADING HOLD", 5: "HEADFREE", 6: "HEAD ADJ",
+    7: "NAV RTH", 8: "NAV POSHOLD", 9: "MANUAL",
+    10: "BEEPER", 11: "NAV LAUNCH",
+    12: "OSD SW", 28: "NAV CRUISE",
+    29: "NAV COURSE HOLD", 45: "ANGLE HOLD",
+}
+
 
-    return times.tolist(), freqs.tolist(), power.tolist()
+@functools.lru_cache(maxsize=256)
+def _flight_mode_label(flags):
+    """Overlay label for a flightModeFlags bitmask.
+
+    A log only cycles through a handful of distinct masks, so each one is
+    decoded once no matter how many slow frames repeat it.
+    """
+    active = [name for bit, name in _FLIGHT_MODE_NAMES.items()
+              if flags & (1 << bit)]
+    return ", ".join(active) if active else "DISARMED"
 
 
 def _extract_flight_modes(data, sr):
@@ -11620,16 +11812,6 @@ def _extract_flight_modes(data, sr):
     if not slow_frames:
         return []
 
-    # INAV flight mode IDs (from src/main/fc/runtime_config.h)
-    MODE_NAMES = {
-        0: "ARM", 1: "ANGLE", 2: "HORIZON", 3: "NAV ALTHOLD",
-        4: "HEADING HOLD", 5: "HEADFREE", 6: "HEAD ADJ",
-        7: "NAV RTH", 8: "NAV POSHOLD", 9: "MANUAL",
-        10: "BEEPER", 11: "NAV LAUNCH",
-        12: "OSD SW", 28: "NAV CRUISE",
-        29: "NAV COURSE HOLD", 45: "ANGLE HOLD",
-    }
-
     n_rows = data.get("n_rows", len(data.get("time_s", [])))
     transitions = []
 
@@ -11650,19 +11832,13 @@ def _extract_flight_modes(data, sr):
             except (ValueError, TypeError):
                 continue
 
-            active_modes = []
-            for bit, name in MODE_NAMES.items():
-                if flags & (1 << bit):
-                    active_modes.append(name)
-
             t_s = frame_idx / sr if sr > 0 else 0
             if frame_idx < n_rows:
                 t_s = data["time_s"][min(frame_idx, len(data["time_s"]) - 1)]
 
             transitions.append({
                 "time_s": float(t_s),
-                "modes": active_modes,
-                "flags": flags,
+                "label": _flight_mode_label(flags),
             })
 
     if not transitions:
@@ -11672,11 +11848,10 @@ def _extract_flight_modes(data, sr):
     segments = []
     for i, tr in enumerate(transitions):
         end_t = transitions[i + 1]["time_s"] if i + 1 < len(transitions) else data["time_s"][-1]
-        label = ", ".join(tr["modes"]) if tr["modes"] else "DISARMED"
         segments.append({
             "start_s": round(tr["time_s"], 3),
             "end_s": round(end_t, 3),
-            "label": label,
+            "label": tr["label"],
         })
 
     return segments
@@ -11691,9 +11866,10 @@ def _generate_replay_html(config, data, sr, noise_results=None):
     duration = data["time_s"][-1]
 
     # Prepare data series — keep more points for Plotly WebGL
+    # Rounded to what the plots can show: short floats make the embedded
+    # JSON (and json.dumps) ~3x cheaper than full-precision reprs.
     max_pts = 20000
-    time_ds = _downsample(data["time_s"], max_pts)
-    step = max(1, len(data["time_s"]) // max_pts)
+    time_ds = _downsample(data["time_s"], max_pts, decimals=4)
 
     # Gyro and setpoint
     gyro_data = {}
@@ -11702,9 +11878,9 @@ def _generate_replay_html(config, data, sr, noise_results=None):
         gk = f"gyro_{ax}"
         sk = f"setpoint_{ax}"
         if gk in data:
-            gyro_data[ax] = _downsample(data[gk], max_pts)
+            gyro_data[ax] = _downsample(data[gk], max_pts, decimals=2)
         if sk in data:
-            sp_data[ax] = _downsample(data[sk], max_pts)
+            sp_data[ax] = _downsample(data[sk], max_pts, decimals=2)
 
     # Motors
     motor_data = {}
@@ -11718,14 +11894,14 @@ def _generate_replay_html(config, data, sr, noise_results=None):
                     raw_min = np.min(raw[raw > 0]) if np.any(raw > 0) else 0
                     rng = raw_max - raw_min if raw_max > raw_min else 1
                     motor_data[f"M{i}"] = _downsample(
-                        (raw - raw_min) / rng * 100, max_pts)
+                        (raw - raw_min) / rng * 100, max_pts, decimals=1)
                 else:
-                    motor_data[f"M{i}"] = _downsample(raw, max_pts)
+                    motor_data[f"M{i}"] = _downsample(raw, max_pts, decimals=1)
 
     # Throttle
     throttle = None
     if "throttle" in data:
-        throttle = _downsample(data["throttle"], max_pts)
+        throttle = _downsample(data["throttle"], max_pts, decimals=1)
 
     # Spectrogram waterfall — compute on roll gyro (most representative)
     spectrogram = None
@@ -11750,7 +11926,7 @@ def _generate_replay_html(config, data, sr, noise_results=None):
     flight_modes = _extract_flight_modes(data, sr)
 
     import json as _json
-    payload = _json.dumps({
+    payload = _compact_json({
         "time": time_ds,
         "gyro": gyro_data,
         "setpoint": sp_data,
@@ -11759,7 +11935,7 @@ def _generate_replay_html(config, data, sr, noise_results=None):
         "spectrogram": spectrogram,
         "flight_modes": flight_modes,
         "duration": duration,
-    }, separators=(',', ':'))
+    })
 
     axis_colors = {"roll": "#FF6B6B", "pitch": "#4ECDC4", "yaw": "#FFD93D"}
     motor_colors = ["#FF6B6B", "#4ECDC4", "#FFD93D", "#A78BFA",
@@ -11827,18 +12003,21 @@ const LAYOUT_BASE = {{
     hovermode: 'x unified',
 }};
 
+const PLOT_CONFIG = {{
+    responsive: true,
+    displayModeBar: true,
+    modeBarButtonsToRemove: ['sendDataToCloud','lasso2d','select2d'],
+    displaylogo: false,
+}};
+
 const allPlotIds = [];
 
-function makePlot(divId, traces, yLabel, extra) {{
+function makePlot(divId, traces, yLabel, extra, yRange) {{
     const layout = JSON.parse(JSON.stringify(LAYOUT_BASE));
     layout.yaxis.title = {{ text: yLabel, font: {{ size: 10 }} }};
+    if (yRange) layout.yaxis.range = yRange;
     if (extra) Object.assign(layout, extra);
-    Plotly.newPlot(divId, traces, layout, {{
-        responsive: true,
-        displayModeBar: true,
-        modeBarButtonsToRemove: ['sendDataToCloud','lasso2d','select2d'],
-        displaylogo: false,
-    }});
+    Plotly.newPlot(divId, traces, layout, PLOT_CONFIG);
     allPlotIds.push(divId);
 }}
 
@@ -11878,14 +12057,7 @@ if (D.spectrogram && document.getElementById('plotSpectro')) {{
                      len: 0.8, thickness: 12 }},
         hovertemplate: '%{{x:.2f}}s<br>%{{y:.0f}}Hz<br>%{{z:.1f}}dB<extra></extra>',
     }};
-    const layout = JSON.parse(JSON.stringify(LAYOUT_BASE));
-    layout.yaxis.title = {{ text: 'Frequency (Hz)', font: {{ size: 10 }} }};
-    layout.yaxis.range = [0, 500];
-    Plotly.newPlot('plotSpectro', [trace], layout, {{
-        responsive: true, displayModeBar: true, displaylogo: false,
-        modeBarButtonsToRemove: ['sendDataToCloud','lasso2d','select2d'],
-    }});
-    allPlotIds.push('plotSpectro');
+    makePlot('plotSpectro', [trace], 'Frequency (Hz)', null, [0, 500]);
 }}
 
 // ── Throttle panel ──
@@ -11900,21 +12072,16 @@ if (D.throttle && document.getElementById('plotThrottle')) {{
 // ── Synced x-axis across all panels ──
 allPlotIds.forEach(srcId => {{
     document.getElementById(srcId).on('plotly_relayout', function(ed) {{
+        let update = null;
         if (ed['xaxis.range[0]'] !== undefined && ed['xaxis.range[1]'] !== undefined) {{
-            const xRange = [ed['xaxis.range[0]'], ed['xaxis.range[1]']];
-            allPlotIds.forEach(tgtId => {{
-                if (tgtId !== srcId) {{
-                    Plotly.relayout(tgtId, {{ 'xaxis.range': xRange }});
-                }}
-            }});
-        }}
-        if (ed['xaxis.autorange']) {{
-            allPlotIds.forEach(tgtId => {{
-                if (tgtId !== srcId) {{
-                    Plotly.relayout(tgtId, {{ 'xaxis.autorange': true }});
-                }}
-            }});
+            update = {{ 'xaxis.range': [ed['xaxis.range[0]'], ed['xaxis.range[1]']] }};
+        }} else if (ed['xaxis.autorange']) {{
+            update = {{ 'xaxis.autorange': true }};
         }}
+        if (!update) return;
+        allPlotIds.forEach(tgtId => {{
+            if (tgtId !== srcId) Plotly.relayout(tgtId, update);
+        }});
     }});
 }});
 
@@ -12000,7 +12167,7 @@ def _run_replay(logfile, args, config_raw):
 
     # Quick noise analysis for spectrogram reference
     print(f"  Computing spectrogram...", end=" ", flush=True)
-    noise_results = [analyze_noise(data, ax, f"gyro_{ax.lower()}", sr) for ax in AXIS_NAMES]
+    noise_results = analyze_noise_axes(data, [(ax, f"gyro_{ax.lower()}") for ax in AXIS_NAMES], sr)
     print("done")
 
     print(f"  Generating Plotly.js replay (WebGL)...")
@@ -12338,7 +12505,7 @@ def _analyze_single_log(logfile, args, config_raw=None, summary_only=False):
 
     # ── Always run core analysis (PID, noise, motors) ──
     hover_osc = detect_hover_oscillation(data, sr, profile)
-    noise_results = [analyze_noise(data, ax, f"gyro_{ax.lower()}", sr) for ax in AXIS_NAMES]
+    noise_results = analyze_noise_axes(data, [(ax, f"gyro_{ax.lower()}") for ax in AXIS_NAMES], sr)
     noise_fp = fingerprint_noise(noise_results, config, prop_harmonics)
     pid_results = [analyze_pid_response(data, i, sr) for i in range(3)]
     motor_analysis = analyze_motors(data, sr, config)
@@ -14,6 +14,7 @@ Missing keys fall back to English. Missing English keys return the key itself.
 Technical terms (PID, Hz, Roll/Pitch/Yaw, CLI commands) stay untranslated.
 """
 
+import functools
 import json
 import os
 import locale as _locale_mod
@@ -58,6 +59,7 @@ def _load_catalog(lang):
 
     data = _read_json_resource(f"{lang}.json")
     _catalogs[lang] = data if data is not None else {}
+    _lookup.cache_clear()  # a new catalog can change fallback results
     return _catalogs[lang]
 
 
@@ -158,34 +160,36 @@ def t(key, **kwargs):
         t("verdict.dialed_in")
         t("quality.too_short", duration="1.2")
     """
+    text = _lookup(_active_locale, key)
+
+    # Apply format substitution
+    if kwargs:
+        try:
+            text = text.format_map(kwargs)
+        except (KeyError, IndexError, ValueError):
+            pass  # Return template as-is if substitution fails
+
+    return text
+
+
+@functools.lru_cache(maxsize=2048)
+def _lookup(lang, key):
+    """Resolve key through the fallback chain for lang (memoized)."""
     # Try active locale
-    catalog = _catalogs.get(_active_locale, {})
-    text = catalog.get(key)
+    text = _catalogs.get(lang, {}).get(key)
 
     # Fallback to base language (e.g., "pt" from "pt_BR")
     if text is None:
-        base = _active_locale.split("_")[0]
-        if base != _active_locale:
-            catalog = _catalogs.get(base, {})
-            text = catalog.get(key)
+        base = lang.split("_")[0]
+        if base != lang:
+            text = _catalogs.get(base, {}).get(key)
 
     # Fallback to English
     if text is None:
-        catalog = _catalogs.get("en", {})
-        text = catalog.get(key)
+        text = _catalogs.get("en", {}).get(key)
 
     # Final fallback: return key itself
-    if text is None:
-        text = key
-
-    # Apply format substitution
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except (KeyError, IndexError, ValueError):
-            pass  # Return template as-is if substitution fails
-
-    return text
+    return key if text is None else text
 
 
 # Auto-initialize English catalog on import
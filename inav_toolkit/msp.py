@@ -24,6 +24,7 @@ Usage:
 
 import glob
 import os
+import re
 import struct
 import sys
 import time
@@ -35,6 +36,9 @@ except ImportError:
 
 VERSION = "2.23.0"
 
+# File write buffer for downloaded logs (1 MiB)
+DEFAULT_IO_BUFFER = 1024 * 1024
+
 # ─── MSP Command IDs ─────────────────────────────────────────────────────────
 
 MSP_API_VERSION         = 1
@@ -48,6 +52,9 @@ MSP_DATAFLASH_READ      = 71
 MSP_DATAFLASH_ERASE     = 72
 MSP_BLACKBOX_CONFIG     = 80
 
+# CLI prompt that terminates each command response ("\r\n# ")
+_CLI_PROMPT_END_RE = re.compile(rb"\n# ?\Z")
+
 # Blackbox device types (from MSP_BLACKBOX_CONFIG byte 0)
 BB_DEVICE_NONE     = 0
 BB_DEVICE_SERIAL   = 1
@@ -188,6 +195,32 @@ def find_serial_ports():
     return candidates
 
 
+def _set_low_latency(ser):
+    """Best-effort switch of a USB-serial port into low-latency mode.
+
+    FTDI-style adapters hold received bytes for up to 16ms (the latency
+    timer) before passing them to the host, which adds up over hundreds
+    of MSP/CLI round-trips. Never raises; returns True on success.
+    """
+    # pyserial >= 3.5 on Linux: TIOCSSERIAL with ASYNC_LOW_LATENCY
+    try:
+        ser.set_low_latency_mode(True)
+        return True
+    except (AttributeError, NotImplementedError, OSError, ValueError):
+        pass
+
+    # Linux usb-serial drivers expose the timer directly in sysfs
+    if not sys.platform.startswith("linux") or not ser.port:
+        return False
+    port = os.path.basename(os.path.realpath(ser.port))
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{port}/latency_timer", "w") as f:
+            f.write("1")
+        return True
+    except OSError:
+        return False
+
+
 def auto_detect_fc(baudrate=115200, timeout=2.0):
     """Scan serial ports and return the first one that responds as INAV.
 
@@ -251,6 +284,7 @@ class INAVDevice:
             parity=serial.PARITY_NONE,
             stopbits=serial.STOPBITS_ONE,
         )
+        _set_low_latency(self._ser)
         # Flush any stale data
         time.sleep(0.1)
         self._ser.reset_input_buffer()
@@ -549,7 +583,8 @@ class INAVDevice:
         return (resp_addr, data)
 
     def download_blackbox(self, output_dir="./blackbox", erase_after=False,
-                          progress_callback=None):
+                          progress_callback=None, filename=None,
+                          io_buffer_size=DEFAULT_IO_BUFFER):
         """Download entire blackbox log from dataflash.
 
         Uses pipelined MSP reads for maximum throughput - multiple read
@@ -560,6 +595,8 @@ class INAVDevice:
             output_dir: Directory to save the .bbl file
             erase_after: If True, erase dataflash after successful download
             progress_callback: Optional fn(bytes_read, total_bytes) for progress
+            filename: Output filename (default: <craft>_<timestamp>.bbl)
+            io_buffer_size: Write buffer size in bytes for the saved file
 
         Returns:
             filepath of saved .bbl file, or None on failure
@@ -598,17 +635,18 @@ class INAVDevice:
             print("  No blackbox data on flash (0 bytes used)")
             return None
 
-        # Get FC info for filename
-        info = self.get_info()
-        craft = info.get("craft_name", "unknown") if info else "unknown"
-        # Sanitize craft name for filename
-        safe_craft = "".join(c if c.isalnum() or c in "-_ " else "_" for c in craft)
-        safe_craft = safe_craft.strip().replace(" ", "_")
-        if not safe_craft:
-            safe_craft = "blackbox"
+        if not filename:
+            # Get FC info for filename
+            info = self.get_info()
+            craft = info.get("craft_name", "unknown") if info else "unknown"
+            # Sanitize craft name for filename
+            safe_craft = "".join(c if c.isalnum() or c in "-_ " else "_" for c in craft)
+            safe_craft = safe_craft.strip().replace(" ", "_")
+            if not safe_craft:
+                safe_craft = "blackbox"
 
-        timestamp = time.strftime("%Y-%m-%d_%H%M%S")
-        filename = f"{safe_craft}_{timestamp}.bbl"
+            timestamp = time.strftime("%Y-%m-%d_%H%M%S")
+            filename = f"{safe_craft}_{timestamp}.bbl"
 
         os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, filename)
@@ -840,7 +878,7 @@ class INAVDevice:
             return None
 
         # Write file
-        with open(filepath, "wb") as f:
+        with open(filepath, "wb", buffering=io_buffer_size) as f:
             f.write(data_buf)
 
         print(f"  ✓ Saved: {filepath} ({len(data_buf) / 1024:.0f}KB in {elapsed:.1f}s, "
@@ -852,9 +890,14 @@ class INAVDevice:
 
         return filepath
 
-    def erase_dataflash(self):
-        """Erase all blackbox data from dataflash."""
-        print("  Erasing dataflash...", end="", flush=True)
+    def erase_dataflash(self, quiet=False):
+        """Erase all blackbox data from dataflash.
+
+        Args:
+            quiet: If True, don't print progress (for background use)
+        """
+        if not quiet:
+            print("  Erasing dataflash...", end="", flush=True)
         self._send(MSP_DATAFLASH_ERASE)
 
         # Erase can take a while - poll until ready
@@ -862,16 +905,19 @@ class INAVDevice:
             time.sleep(0.5)
             summary = self.get_dataflash_summary()
             if summary and summary["ready"] and summary["used_size"] == 0:
-                print(" done")
+                if not quiet:
+                    print(" done")
                 return True
 
         # Check one more time
         summary = self.get_dataflash_summary()
         if summary and summary["used_size"] == 0:
-            print(" done")
+            if not quiet:
+                print(" done")
             return True
 
-        print(" timeout (flash may still be erasing)")
+        if not quiet:
+            print(" timeout (flash may still be erasing)")
         return False
 
     # ── CLI Mode (for diff all) ───────────────────────────────────────────
@@ -938,6 +984,7 @@ class INAVDevice:
                     parity=_serial.PARITY_NONE,
                     stopbits=_serial.STOPBITS_ONE,
                 )
+                _set_low_latency(self._ser)
                 time.sleep(0.2)
                 self._ser.reset_input_buffer()
                 self._ser.reset_output_buffer()
@@ -1105,16 +1152,21 @@ class INAVDevice:
         result = "\n".join(result_lines).strip()
         return result if result else None
 
-    def cli_batch(self, commands, timeout=5.0, save=True):
+    def cli_batch(self, commands, timeout=5.0, save=True, chunk_size=1):
         """Send multiple CLI commands in a single CLI session.
 
         Enters CLI mode once, sends all commands, optionally saves,
         then exits. Much faster than calling cli_command() per line.
 
+        With chunk_size > 1, commands are written to the port in groups
+        and their responses collected afterwards, so a large restore does
+        not pay one serial round-trip per setting.
+
         Args:
             commands: List of CLI command strings (e.g., ['set mc_p_roll = 28'])
             timeout: Max seconds to wait per command response
             save: If True, sends 'save' after all commands
+            chunk_size: Number of commands written per serial write
 
         Returns:
             List of (command, response) tuples
@@ -1132,38 +1184,13 @@ class INAVDevice:
             ser.read(ser.in_waiting)
 
         results = []
-        all_cmds = list(commands)
+        cmds = list(commands)
+        chunk_size = max(1, int(chunk_size))
+        for start in range(0, len(cmds), chunk_size):
+            results.extend(self._cli_send_chunk(cmds[start:start + chunk_size], timeout))
+        # 'save' reboots the FC, so it always goes on its own
         if save:
-            all_cmds.append("save")
-
-        for cmd in all_cmds:
-            ser.write((cmd + "\n").encode("ascii"))
-            time.sleep(0.05)
-
-            # Read until prompt
-            buf = b""
-            deadline = time.monotonic() + timeout
-            while time.monotonic() < deadline:
-                if ser.in_waiting:
-                    buf += ser.read(ser.in_waiting)
-                    if buf.rstrip().endswith(b"#") or buf.endswith(b"# "):
-                        break
-                else:
-                    time.sleep(0.01)
-
-            try:
-                text = buf.decode("ascii", errors="replace")
-            except Exception:
-                text = ""
-
-            # Clean response
-            lines = []
-            for line in text.splitlines():
-                line = line.rstrip()
-                if line == cmd or line == "#" or line == "# ":
-                    continue
-                lines.append(line)
-            results.append((cmd, "\n".join(lines).strip()))
+            results.extend(self._cli_send_chunk(["save"], timeout))
 
         # Exit CLI mode (if save was sent, FC will reboot — USB may reset)
         try:
@@ -1178,10 +1205,73 @@ class INAVDevice:
 
         return results
 
+    def _cli_send_chunk(self, chunk, timeout):
+        """Write a group of CLI commands at once and split the responses.
+
+        Each command is answered with its echo, any output, and a
+        '# ' prompt. Responses are anchored on the echoes (see
+        _split_cli_responses), so output lines starting with '#' do not
+        shift later responses. Reading stops once the last command's
+        echo has been followed by a prompt, or after `timeout` seconds
+        without new bytes (capped at timeout * len(chunk) overall).
+        Returns list of (command, response) tuples.
+        """
+        ser = self._ser
+        ser.write("".join(cmd + "\n" for cmd in chunk).encode("ascii"))
+        time.sleep(0.05)
+
+        buf = b""
+        now = time.monotonic()
+        hard_deadline = now + timeout * len(chunk)
+        idle_deadline = now + timeout
+        while True:
+            now = time.monotonic()
+            if now >= hard_deadline or now >= idle_deadline:
+                break
+            if ser.in_waiting:
+                buf += ser.read(ser.in_waiting)
+                idle_deadline = time.monotonic() + timeout
+                if (_CLI_PROMPT_END_RE.search(buf)
+                        and _split_cli_responses(buf.decode("ascii", errors="replace"),
+                                                 chunk)[-1] is not None):
+                    break
+            else:
+                time.sleep(0.01)
+
+        responses = _split_cli_responses(buf.decode("ascii", errors="replace"), chunk)
+        return [(cmd, resp or "") for cmd, resp in zip(chunk, responses)]
+
+
+def _split_cli_responses(text, commands):
+    """Split CLI output for commands sent back to back.
+
+    A command's response is everything between its echoed command line
+    (possibly preceded by the '# ' prompt on the same line) and the next
+    command's echo. Echoes are matched in order, so a dropped echo only
+    loses that command's response. Bare prompt lines are discarded.
+
+    Returns a list with one response string per command, or None for
+    commands whose echo never arrived.
+    """
+    responses = [None] * len(commands)
+    current = -1
+    for line in text.splitlines():
+        line = line.rstrip()
+        bare = line[1:].lstrip() if line.startswith("#") else line
+        for j in range(current + 1, len(commands)):
+            if bare == commands[j]:
+                current = j
+                responses[j] = []
+                break
+        else:
+            if current >= 0 and line != "#":
+                responses[current].append(line)
+    return [None if r is None else "\n".join(r).strip() for r in responses]
+
 
 # ─── CLI Entrypoint ──────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
     """Standalone usage: identify FC and download blackbox."""
     import argparse
 
@@ -1200,7 +1290,7 @@ def main():
                         help="Erase dataflash after successful download")
     parser.add_argument("--info-only", action="store_true",
                         help="Only show FC info, don't download")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print(f"\n  ▲ INAV MSP v{VERSION}")
 
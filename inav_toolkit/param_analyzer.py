@@ -80,6 +80,8 @@ GPS_MODES = {10, 11, 13, 48}  # POSHOLD, RTH, WP, COURSE HOLD
 ALT_MODES = {3}  # NAV ALTHOLD
 # Modes that benefit from compass
 COMPASS_MODES = {10, 11, 13, 5}  # POSHOLD, RTH, WP, HEADING HOLD
+# Beepers the sanity check warns about when disabled
+CRITICAL_BEEPERS = ("BAT_CRIT_LOW", "BAT_LOW", "RX_LOST", "RX_LOST_LANDING")
 
 # Multirotor platform types
 MC_PLATFORMS = {"MULTIROTOR", "TRICOPTER"}
@@ -567,9 +569,9 @@ def print_setup_report(config):
     print(f"\n{B}{C}{'='*70}{R}\n")
 
 
-def print_setup_json(config):
-    """Output setup config as JSON."""
-    output = {
+def setup_json(config):
+    """JSON-ready dict for a generate_setup_config() result."""
+    return {
         "frame_inches": config["frame"],
         "voltage": config["voltage"],
         "profile_name": config["profile"]["name"],
@@ -581,13 +583,29 @@ def print_setup_json(config):
         "notes": config["profile"]["notes"],
         "voltage_notes": config["v_adj"]["notes"],
     }
-    print(json.dumps(output, indent=2))
+
+
+def print_setup_json(config):
+    """Output setup config as JSON."""
+    print(json.dumps(setup_json(config), indent=2))
 
 
 # ─── Parser ──────────────────────────────────────────────────────────────────
 
 def parse_diff_all(text):
     """Parse INAV `diff all` output into structured data."""
+    result = parse_diff_all_lines(text.splitlines())
+    result["raw_text"] = text
+    return result
+
+
+def parse_diff_all_lines(lines):
+    """Parse INAV `diff all` output from an iterable of lines.
+
+    Accepts an open file object directly, so large diffs are parsed as
+    they are read instead of being loaded into one string first. Unlike
+    parse_diff_all(), the result has no "raw_text".
+    """
     result = {
         "version": None,
         "board": None,
@@ -609,14 +627,14 @@ def parse_diff_all(text):
         "serial_ports": {},
         "aux_modes": [],
         "motor_mix": [],
-        "raw_text": text,
+        "has_safehome": False,
     }
 
     current_section = "master"
     current_profile_type = None
     current_profile_num = 1
 
-    for line in text.splitlines():
+    for line in lines:
         line = line.strip()
         if not line or line.startswith("#"):
             # Check for version comment
@@ -634,6 +652,10 @@ def parse_diff_all(text):
                     result["git_hash"] = gm.group(1)
             continue
 
+        lower = line.lower()
+        if "safehome" in lower and "set" in lower:
+            result["has_safehome"] = True
+
         # Feature lines
         if line.startswith("feature "):
             feat = line[8:].strip()
@@ -1292,10 +1314,7 @@ def check_navigation(parsed, frame_inches=None):
     profile = get_active_control(parsed)
 
     # Safehome
-    has_safehome = any("safehome" in line.lower() and "set" in line.lower()
-                       for line in parsed["raw_text"].splitlines()
-                       if not line.strip().startswith("#"))
-    if not has_safehome:
+    if not parsed["has_safehome"]:
         findings.append(Finding(
             INFO, "Navigation", "No safehome configured",
             "Safehome lets you define alternative landing points for RTH. "
@@ -1801,6 +1820,14 @@ def check_crossref_blackbox(parsed, bb_state):
 # Different from the tuning-focused analysis above — this catches
 # dangerous misconfigurations that can destroy hardware or hurt people.
 
+# (axis label, setting, INAV default) for the rate checks
+_SANITY_RATE_DEFAULTS = (
+    ("Roll", "roll_rate", 40),
+    ("Pitch", "pitch_rate", 40),
+    ("Yaw", "yaw_rate", 30),
+)
+
+
 class SanityItem:
     """A single pre-flight check result."""
     FAIL = "FAIL"
@@ -1912,6 +1939,12 @@ def run_sanity_check(parsed, frame_inches=None, interactive=True):
     motor_count = _detect_motor_count(parsed)
     profile = get_active_control(parsed)
 
+    # Case-normalize string settings once; non-strings compare as ""
+    platform = get_setting(parsed, "platform_type", "")
+    plat_u = platform.upper() if isinstance(platform, str) else ""
+    osd_video = get_setting(parsed, "osd_video_system", "")
+    osd_u = osd_video.upper() if isinstance(osd_video, str) else ""
+
     # ── 1. ARMING ────────────────────────────────────────────────────────
     if 0 not in assigned_modes:
         items.append(SanityItem(
@@ -2161,14 +2194,10 @@ def run_sanity_check(parsed, frame_inches=None, interactive=True):
                 f"PIDs in reasonable range (P_roll={p_roll}, P_pitch={p_pitch})"))
 
     # ── 8. RATES ─────────────────────────────────────────────────────────
-    roll_rate = get_setting(parsed, "roll_rate",
-                            profile.get("roll_rate", 40))
-    pitch_rate = get_setting(parsed, "pitch_rate",
-                             profile.get("pitch_rate", 40))
-    yaw_rate = get_setting(parsed, "yaw_rate",
-                           profile.get("yaw_rate", 30))
-
-    for axis, rate in [("Roll", roll_rate), ("Pitch", pitch_rate), ("Yaw", yaw_rate)]:
+    # get_setting() already checks the active profile, so only the
+    # firmware defaults are needed as fallbacks.
+    for axis, key, default in _SANITY_RATE_DEFAULTS:
+        rate = get_setting(parsed, key, default)
         if isinstance(rate, (int, float)):
             if rate == 0:
                 items.append(SanityItem(
@@ -2293,17 +2322,15 @@ def run_sanity_check(parsed, frame_inches=None, interactive=True):
             "Standard orientation (no rotation)"))
 
     # ── 12. OSD / VIDEO ──────────────────────────────────────────────────
-    osd_video = get_setting(parsed, "osd_video_system", "")
-    if isinstance(osd_video, str) and osd_video.upper() not in ("", "AUTO"):
+    if osd_u not in ("", "AUTO"):
         # Has specific video system configured
         items.append(SanityItem(
             SanityItem.PASS, "OSD",
             f"OSD video system: {osd_video}"))
 
     # ── 13. BEEPER SAFETY ────────────────────────────────────────────────
-    critical_beepers = ["BAT_CRIT_LOW", "BAT_LOW", "RX_LOST", "RX_LOST_LANDING"]
     disabled = parsed.get("beepers_disabled", [])
-    missing_critical = [b for b in critical_beepers if b in disabled]
+    missing_critical = [b for b in CRITICAL_BEEPERS if b in disabled]
     if missing_critical:
         items.append(SanityItem(
             SanityItem.WARN, "Safety",
@@ -2317,8 +2344,7 @@ def run_sanity_check(parsed, frame_inches=None, interactive=True):
             "Critical beepers enabled"))
 
     # ── 14. TRICOPTER SERVO ──────────────────────────────────────────────
-    platform = get_setting(parsed, "platform_type", "")
-    if isinstance(platform, str) and "TRI" in platform.upper():
+    if "TRI" in plat_u:
         # Check servo direction
         items.append(SanityItem(
             SanityItem.ASK, "Platform",
@@ -2359,6 +2385,11 @@ def run_sanity_check(parsed, frame_inches=None, interactive=True):
     return items
 
 
+def _plural(n, plural="s", singular=""):
+    """Return the suffix for a count: plural unless n == 1."""
+    return singular if n == 1 else plural
+
+
 def print_sanity_report(items, parsed, interactive=True):
     """Print the interactive pre-flight sanity check report."""
     R, B, C, G, Y, RED, DIM = _colors()
@@ -2468,25 +2499,27 @@ def print_sanity_report(items, parsed, interactive=True):
     print(f"  {B}  PRE-FLIGHT VERDICT{R}")
     print(f"  {B}{'=' * 55}{R}")
 
-    if n_fail > 0:
-        print(f"    {RED}✗{R} {n_fail} CRITICAL issue{'s' if n_fail > 1 else ''} — must fix before flying")
-    if n_warn > 0:
-        print(f"    {Y}⚠{R} {n_warn} WARNING{'s' if n_warn > 1 else ''} — review recommended")
-    if n_ask_unconfirmed > 0:
-        print(f"    {C}?{R} {n_ask_unconfirmed} item{'s' if n_ask_unconfirmed > 1 else ''} need{'s' if n_ask_unconfirmed == 1 else ''} pilot confirmation (use --check without --no-interactive)")
-    if n_pass > 0:
-        print(f"    {G}✓{R} {n_pass} check{'s' if n_pass > 1 else ''} passed")
+    summary = (
+        (n_fail, RED, "✗", f"CRITICAL issue{_plural(n_fail)} — must fix before flying"),
+        (n_warn, Y, "⚠", f"WARNING{_plural(n_warn)} — review recommended"),
+        (n_ask_unconfirmed, C, "?",
+         f"item{_plural(n_ask_unconfirmed)} need{_plural(n_ask_unconfirmed, '', 's')} "
+         "pilot confirmation (use --check without --no-interactive)"),
+        (n_pass, G, "✓", f"check{_plural(n_pass)} passed"),
+    )
+    for n, col, icon, text in summary:
+        if n > 0:
+            print(f"    {col}{icon}{R} {n} {text}")
 
     print()
     if n_fail > 0:
-        print(f"    {RED}{B}██ NO-GO ██{R}")
-        print(f"    {RED}Fix critical issues and run --check again.{R}")
+        col, banner, hint = RED, "NO-GO", "Fix critical issues and run --check again."
     elif n_warn > 0 or n_ask_unconfirmed > 0:
-        print(f"    {Y}{B}██ CONDITIONAL ██{R}")
-        print(f"    {Y}Review warnings before flying.{R}")
+        col, banner, hint = Y, "CONDITIONAL", "Review warnings before flying."
     else:
-        print(f"    {G}{B}██ GO ██{R}")
-        print(f"    {G}All checks passed. Fly safe!{R}")
+        col, banner, hint = G, "GO", "All checks passed. Fly safe!"
+    print(f"    {col}{B}██ {banner} ██{R}")
+    print(f"    {col}{hint}{R}")
     print()
 
     return n_fail
@@ -2626,7 +2659,7 @@ def print_report(parsed, findings, frame_inches=None):
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description=f"INAV Parameter Analyzer v{VERSION} - Check diff all for issues",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -2664,7 +2697,7 @@ def main():
     parser.add_argument("--lang", metavar="LANG",
                         help="Language for output (en, pt_BR, es). "
                              "Auto-detects from INAV_LANG env var or system locale.")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Initialize localization
     try:
@@ -2684,20 +2717,19 @@ def main():
     # ─── Sanity check mode ─────────────────────────────────────────────
     if args.check:
         if args.device:
-            text = _pull_diff_from_device(args.device, args.no_color)
+            parsed = parse_diff_all(_pull_diff_from_device(args.device, args.no_color))
         elif args.difffile:
             if args.difffile == "-":
-                text = sys.stdin.read()
+                parsed = parse_diff_all(sys.stdin.read())
             else:
                 if not os.path.isfile(args.difffile):
                     print(f"ERROR: File not found: {args.difffile}")
                     sys.exit(1)
                 with open(args.difffile, "r", errors="replace") as f:
-                    text = f.read()
+                    parsed = parse_diff_all_lines(f)
         else:
             parser.error("--check requires a diff file or --device")
 
-        parsed = parse_diff_all(text)
         interactive = not args.no_interactive
         items = run_sanity_check(parsed, frame_inches=args.frame,
                                  interactive=interactive)
@@ -2717,7 +2749,7 @@ def main():
             n_fail = print_sanity_report(items, parsed, interactive=interactive)
             sys.exit(1 if n_fail > 0 else 0)
         return
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.no_color:
         _disable_colors()
@@ -2742,8 +2774,7 @@ def main():
         # If a diff file was also provided, show what would change
         if args.difffile and os.path.isfile(args.difffile):
             with open(args.difffile, "r", errors="replace") as f:
-                text = f.read()
-            parsed = parse_diff_all(text)
+                parsed = parse_diff_all_lines(f)
             profile = get_active_control(parsed)
 
             R, B, C, G, Y, _RED, DIM = _colors()
@@ -2775,20 +2806,18 @@ def main():
 
     # Load diff all
     if args.difffile == "-":
-        text = sys.stdin.read()
+        parsed = parse_diff_all(sys.stdin.read())
     else:
         if not os.path.isfile(args.difffile):
             print(f"ERROR: File not found: {args.difffile}")
             sys.exit(1)
         with open(args.difffile, "r", errors="replace") as f:
-            text = f.read()
+            parsed = parse_diff_all_lines(f)
 
     if not args.json:
         print(f"\n  ▲ INAV Parameter Analyzer v{VERSION}")
         print(f"  Loading: {args.difffile}")
 
-    parsed = parse_diff_all(text)
-
     if not args.json:
         if parsed["version"]:
             print(f"  Firmware: INAV {parsed['version']} on {parsed['board']}")
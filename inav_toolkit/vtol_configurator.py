@@ -801,7 +801,18 @@ def print_report(parsed, findings):
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
-def main():
+def findings_json(findings):
+    """JSON-ready list of dicts for run_vtol_checks() findings."""
+    return [{
+        "severity": f.severity,
+        "category": f.category,
+        "title": f.title,
+        "detail": f.detail,
+        "cli_fix": f.cli_fix,
+    } for f in findings]
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description=f"INAV VTOL Configurator v{VERSION} - Validate VTOL mixer profiles",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -816,7 +827,7 @@ def main():
                         help="Output findings as JSON")
     parser.add_argument("--no-color", action="store_true",
                         help="Disable colored terminal output.")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.no_color:
         _disable_colors()
@@ -840,14 +851,7 @@ def main():
     findings = run_vtol_checks(parsed)
 
     if args.json:
-        output = [{
-            "severity": f.severity,
-            "category": f.category,
-            "title": f.title,
-            "detail": f.detail,
-            "cli_fix": f.cli_fix,
-        } for f in findings]
-        print(json.dumps(output, indent=2))
+        print(json.dumps(findings_json(findings), indent=2))
     else:
         print_report(parsed, findings)
 
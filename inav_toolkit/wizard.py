@@ -11,18 +11,30 @@ Usage:
     inav-toolkit --device /dev/ttyACM0    # Specify port
 """
 
+import importlib
+import importlib.util
 import json
 import os
 import re
+import signal
 import subprocess
 import sys
+import threading
 import time
+from datetime import datetime
 
 try:
     from inav_toolkit import __version__ as VERSION
 except ImportError:
     VERSION = "2.23.0"
 
+# orjson is an optional speedup (pip install inav-toolkit[fast])
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Module paths for subprocess invocation (package-aware)
 ANALYZER_MODULE = "inav_toolkit.blackbox_analyzer"
 PARAM_MODULE = "inav_toolkit.param_analyzer"
@@ -31,6 +43,34 @@ ANALYZER_SCRIPT = "inav_blackbox_analyzer.py"
 PARAM_SCRIPT = "inav_param_analyzer.py"
 
 
+def _io_buffer_size():
+    """File write buffer size; INAV_TOOLKIT_IO_BUFFER overrides the 1 MiB default."""
+    try:
+        size = int(os.environ.get("INAV_TOOLKIT_IO_BUFFER", ""))
+    except ValueError:
+        return 1024 * 1024
+    return size if size > 0 else 1024 * 1024
+
+
+IO_BUFFER = _io_buffer_size()
+
+# CLI commands written per serial write when replaying settings
+CLI_CHUNK_SIZE = 64
+
+# "set param = value" inside analyzer action text
+_SET_CMD_RE = re.compile(r"set\s+\S+\s*=\s*\S+")
+# Same, split into (param, value) for a single command or diff line
+_SET_PARTS_RE = re.compile(r"set\s+(\S+)\s*=\s*(.*)")
+# CLI responses that flag a rejected command
+_CLI_INVALID_RE = re.compile(r"invalid", re.IGNORECASE)
+_CLI_ERROR_RE = re.compile(r"invalid|error", re.IGNORECASE)
+# Lines that switch the diff into a profile section
+_PROFILE_LINE_RE = re.compile(r"(control|mixer|battery)_profile\s+(\d+)")
+# File names of toolkit backups and of diffs saved next to a log
+_BACKUP_NAME_RE = re.compile(r"_backup_.*\.txt\Z")
+_DIFF_NAME_RE = re.compile(r"(_diff|^diff(_all)?)\.txt\Z")
+
+
 # ─── Color Support ────────────────────────────────────────────────────────────
 
 def _enable_ansi_colors():
@@ -74,14 +114,37 @@ def _script_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 
+# Resolved command prefixes keyed by (module_path, fallback_script)
+_MODULE_CMD_CACHE = {}
+
+
 def _module_cmd(module_path, fallback_script=None):
     """Build command prefix to run a toolkit module.
 
     Works both as installed package (python -m inav_toolkit.X)
     and from legacy script layout (python inav_blackbox_analyzer.py).
+    The result (including None) is cached for the life of the process.
     """
+    key = (module_path, fallback_script)
+    if key not in _MODULE_CMD_CACHE:
+        _MODULE_CMD_CACHE[key] = _resolve_module_cmd(module_path, fallback_script)
+    cmd = _MODULE_CMD_CACHE[key]
+    return list(cmd) if cmd else None
+
+
+def _resolve_module_cmd(module_path, fallback_script=None):
+    """Uncached lookup behind _module_cmd()."""
     # Try package module first (pip install or running from repo root)
     cmd = [sys.executable, "-m", module_path]
+    # Running from the installed package: sibling modules are importable
+    if __package__ and module_path.startswith(__package__ + "."):
+        return cmd
+    try:
+        # Importable in-process: no need to spawn a probe interpreter
+        if importlib.util.find_spec(module_path) is not None:
+            return cmd
+    except (ImportError, ValueError):
+        pass
     try:
         # Quick check: can Python find this module?
         result = subprocess.run(
@@ -111,6 +174,133 @@ def _module_cmd(module_path, fallback_script=None):
     return None
 
 
+class _ToolTimeout(BaseException):
+    """Raised by the SIGALRM handler in _run_in_process.
+
+    A BaseException so the tools' broad ``except Exception`` blocks can't
+    swallow it; converted to TimeoutError once main() has been unwound.
+    """
+
+
+def _run_in_process(module_path, argv, timeout):
+    """Call a toolkit module's main(argv) in this process.
+
+    Saves the interpreter startup and numpy/scipy import cost of a
+    subprocess. The timeout is enforced with SIGALRM, so this only runs
+    on POSIX from the main thread.
+
+    Returns:
+        (returncode, output) or None if the module can't be run in-process
+
+    Raises:
+        TimeoutError: if main() runs longer than timeout seconds
+    """
+    if not hasattr(signal, "SIGALRM"):
+        return None
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    import contextlib
+    import inspect
+    import io
+    import traceback
+    try:
+        module = importlib.import_module(module_path)
+    except ImportError:
+        return None
+    entry = getattr(module, "main", None)
+    if entry is None or "argv" not in inspect.signature(entry).parameters:
+        return None
+
+    def _on_alarm(signum, frame):
+        raise _ToolTimeout()
+
+    buf = io.StringIO()
+    prev_handler = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.alarm(timeout)
+    try:
+        with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+            try:
+                entry(argv)
+                rc = 0
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    rc = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    rc = 1
+            except Exception:
+                # Same outcome as a crashed subprocess: traceback + rc=1
+                traceback.print_exc()
+                rc = 1
+    except _ToolTimeout:
+        raise TimeoutError(f"{module_path} timed out ({timeout}s)") from None
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, prev_handler)
+    return rc, buf.getvalue()
+
+
+def _run_tool(module_path, fallback_script, argv, timeout):
+    """Run a toolkit module, in-process when possible, else as a subprocess.
+
+    Returns:
+        (returncode, output) or None if the module can't be found
+
+    Raises:
+        TimeoutError: if the tool runs longer than timeout seconds
+    """
+    ran = _run_in_process(module_path, argv, timeout)
+    if ran is not None:
+        return ran
+
+    cmd_prefix = _module_cmd(module_path, fallback_script)
+    if not cmd_prefix:
+        return None
+    try:
+        result = subprocess.run(cmd_prefix + argv, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"{module_path} timed out ({timeout}s)")
+    return result.returncode, result.stdout + result.stderr
+
+
+def _count_set_lines(diff_raw):
+    """Count 'set ' lines in CLI diff text without splitting it into lines."""
+    return diff_raw.count("\nset ") + diff_raw.startswith("set ")
+
+
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path):
+    """os.makedirs(path, exist_ok=True), done once per path per process."""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+def _section(title):
+    """Flow section header line; plain text when colors are off."""
+    if not B:
+        return f"\n  --- {title} ---"
+    return f"\n  {B}{C}--- {title} ---{R}"
+
+
+def _list_files(directory):
+    """Names of the regular files in a directory (empty set if unreadable)."""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if e.is_file()}
+    except OSError:
+        return set()
+
+
+def _write_lines(lines):
+    """Print a block of lines with a single write instead of one per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def _clear_line():
     """Clear current terminal line."""
     print("\r" + " " * 70 + "\r", end="", flush=True)
@@ -170,17 +360,69 @@ def _banner():
 
 # ─── FC Connection ────────────────────────────────────────────────────────────
 
-def _connect_fc(port=None):
-    """Connect to FC and return (device, info) or (None, None)."""
-    try:
-        from inav_toolkit.msp import INAVDevice, auto_detect_fc, find_serial_ports
-    except ImportError:
+_MSP = None
+
+
+def _load_msp():
+    """Import the MSP module once and return it, or None if unavailable.
+
+    main() calls this on a background thread while the banner and first
+    prompt are up, so the pyserial import is usually done by the time
+    _connect_fc needs it.
+    """
+    global _MSP
+    if _MSP is None:
         try:
-            from inav_msp import INAVDevice, auto_detect_fc, find_serial_ports
+            from inav_toolkit import msp
         except ImportError:
-            print(f"  {RED}ERROR: MSP module not found{R}")
-            print(f"  Install: pip install inav-toolkit[serial]")
-            return None, None
+            try:
+                import inav_msp as msp
+            except ImportError:
+                return None
+        _MSP = msp
+    return _MSP
+
+
+# Last port an FC answered on, tried before a full scan for an hour
+LAST_PORT_MAX_AGE = 3600
+
+
+def _last_port_file():
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "inav-toolkit", "last_port")
+
+
+def _read_last_port():
+    """Port from the last successful connection, or None if stale/missing."""
+    path = _last_port_file()
+    try:
+        if time.time() - os.path.getmtime(path) > LAST_PORT_MAX_AGE:
+            return None
+        with open(path, "r") as f:
+            return f.readline().strip() or None
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _remember_port(port):
+    """Best-effort save of the port for the next run."""
+    path = _last_port_file()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(port + "\n")
+    except OSError:
+        pass
+
+
+def _connect_fc(port=None):
+    """Connect to FC and return (device, info) or (None, None)."""
+    msp = _load_msp()
+    if msp is None:
+        print(f"  {RED}ERROR: MSP module not found{R}")
+        print(f"  Install: pip install inav-toolkit[serial]")
+        return None, None
 
     try:
         import serial
@@ -193,7 +435,7 @@ def _connect_fc(port=None):
     if port and port != "auto":
         print(f"  Connecting to {port}...", end="", flush=True)
         try:
-            fc = INAVDevice(port)
+            fc = msp.INAVDevice(port)
             fc.open()
             info = fc.get_info()
             if info and info.get("fc_variant") == "INAV":
@@ -206,13 +448,13 @@ def _connect_fc(port=None):
         return None, None
 
     print(f"  Scanning for INAV flight controller...", end="", flush=True)
-    fc, info = auto_detect_fc()
+    fc, info = msp.auto_detect_fc()
     if fc and info:
         print(f" {G}found{R}")
         return fc, info
 
     print(f" {Y}not found{R}")
-    ports = find_serial_ports()
+    ports = msp.find_serial_ports()
     if ports:
         print(f"    Ports detected but none responded as INAV: {', '.join(ports)}")
         print(f"    Make sure the FC is powered and not in DFU mode.")
@@ -226,10 +468,11 @@ def _print_fc_info(info):
     craft = info.get("craft_name") or "(unnamed)"
     fw = info.get("firmware", "")
     board = info.get("board_id", "")
-    print(f"\n  {B}Aircraft:{R}  {craft}")
-    print(f"  {B}Firmware:{R}  {fw}")
+    lines = [f"\n  {B}Aircraft:{R}  {craft}",
+             f"  {B}Firmware:{R}  {fw}"]
     if board:
-        print(f"  {B}Board:{R}     {board}")
+        lines.append(f"  {B}Board:{R}     {board}")
+    _write_lines(lines)
 
 
 # ─── Download & Analyze ──────────────────────────────────────────────────────
@@ -256,7 +499,8 @@ def _download_blackbox(fc, info, output_dir="./blackbox"):
     craft = info.get("craft_name") or "fc"
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = f"{craft}_{timestamp}.bbl"
-    filepath = fc.download_blackbox(output_dir=output_dir, filename=filename)
+    filepath = fc.download_blackbox(output_dir=output_dir, filename=filename,
+                                    io_buffer_size=IO_BUFFER)
 
     if filepath and os.path.isfile(filepath):
         return filepath
@@ -268,18 +512,80 @@ def _pull_diff(fc, output_dir="./blackbox", craft_name="fc"):
     print(f"  Pulling configuration...", end="", flush=True)
     diff_raw = fc.get_diff_all(timeout=10.0)
     if diff_raw:
-        n = len([l for l in diff_raw.splitlines() if l.strip().startswith("set ")])
+        n = _count_set_lines(diff_raw)
         print(f" {n} settings")
         # Save alongside blackbox
-        diff_path = os.path.join(output_dir, f"{craft_name}_diff.txt")
-        os.makedirs(output_dir, exist_ok=True)
-        with open(diff_path, "w") as f:
-            f.write(diff_raw)
+        _write_diff(diff_raw, output_dir, craft_name)
         return diff_raw
     print(f" {Y}no response{R}")
     return None
 
 
+def _write_diff(diff_raw, output_dir="./blackbox", craft_name="fc"):
+    """Save diff text as <craft>_diff.txt. Returns the file path."""
+    diff_path = os.path.join(output_dir, f"{craft_name}_diff.txt")
+    _ensure_dir(output_dir)
+    with open(diff_path, "w", buffering=IO_BUFFER) as f:
+        f.write(diff_raw)
+    return diff_path
+
+
+def _patch_diff(diff_raw, commands):
+    """Apply 'set' commands to a cached diff instead of re-pulling it.
+
+    The FC applies a 'set' to the master settings or to the active
+    profile, so only lines in those sections are updated in place; new
+    settings are inserted ahead of the first profile section, where the
+    parsers read them as global.
+
+    Returns:
+        Patched diff text, or None if a command can't be placed
+        unambiguously (caller should pull a fresh diff from the FC)
+    """
+    lines = diff_raw.splitlines()
+    index = {}      # param -> [(line number, section)]
+    section = None  # None = master, else (profile type, number)
+    active = {}     # profile type -> number; the diff ends by re-selecting it
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        m = _PROFILE_LINE_RE.match(stripped)
+        if m:
+            section = (m.group(1), int(m.group(2)))
+            active[m.group(1)] = section[1]
+            continue
+        m = _SET_PARTS_RE.match(stripped)
+        if m:
+            index.setdefault(m.group(1), []).append((i, section))
+
+    new_lines = []
+    for cmd in commands:
+        m = _SET_PARTS_RE.match(cmd.strip())
+        if not m:
+            return None
+        param, value = m.group(1), m.group(2).strip()
+        hits = index.get(param, [])
+        live = [i for i, sec in hits
+                if sec is None or active.get(sec[0], 1) == sec[1]]
+        if len(live) > 1 or (hits and not live):
+            # Ambiguous, or only set in an inactive profile (the active
+            # one holds the default) - can't tell where the change landed
+            return None
+        if live:
+            lines[live[0]] = f"set {param} = {value}"
+        else:
+            new_lines.append(f"set {param} = {value}")
+
+    if new_lines:
+        insert_at = len(lines)
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if _PROFILE_LINE_RE.match(stripped) or stripped == "save":
+                insert_at = i
+                break
+        lines[insert_at:insert_at] = new_lines
+    return "\n".join(lines)
+
+
 def _run_analyzer(logfile, mode="tune", diff_file=None, frame=None, extra_args=None):
     """Run the blackbox analyzer and return results.
 
@@ -294,45 +600,46 @@ def _run_analyzer(logfile, mode="tune", diff_file=None, frame=None, extra_args=N
         dict with keys: success, score, verdict, actions, state_json_path,
                         html_path, output (terminal text)
     """
-    cmd_prefix = _module_cmd(ANALYZER_MODULE, ANALYZER_SCRIPT)
-    if not cmd_prefix:
-        return {"success": False, "output": f"Cannot find analyzer module"}
-
-    cmd = cmd_prefix + [logfile]
+    argv = [logfile]
     if mode == "nav":
-        cmd.append("--nav")
+        argv.append("--nav")
     if diff_file:
-        cmd.extend(["--diff", diff_file])
+        argv.extend(["--diff", diff_file])
     if frame:
-        cmd.extend(["--frame", str(frame)])
+        argv.extend(["--frame", str(frame)])
     if extra_args:
-        cmd.extend(extra_args)
+        argv.extend(extra_args)
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-        output = result.stdout + result.stderr
-    except subprocess.TimeoutExpired:
+        ran = _run_tool(ANALYZER_MODULE, ANALYZER_SCRIPT, argv, timeout=120)
+    except TimeoutError:
         return {"success": False, "output": "Analysis timed out (120s)"}
     except Exception as e:
         return {"success": False, "output": str(e)}
+    if ran is None:
+        return {"success": False, "output": f"Cannot find analyzer module"}
+    returncode, output = ran
+
+    # Analyzer artifacts sit next to the log: one directory scan finds them all
+    base = logfile.rsplit(".", 1)[0]
+    present = _list_files(os.path.dirname(base) or ".")
+    stem = os.path.basename(base)
 
     # Find state.json
-    state_json = logfile.rsplit(".", 1)[0] + "_state.json"
+    state_json = base + "_state.json"
     state = None
-    if os.path.isfile(state_json):
+    if stem + "_state.json" in present:
         try:
-            with open(state_json, "r") as f:
-                state = json.load(f)
+            with open(state_json, "rb") as f:
+                state = _json_loads(f.read())
         except Exception:
             pass
 
     # Find HTML report
     html_path = None
-    base = logfile.rsplit(".", 1)[0]
     for suffix in ("_report.html", "_nav_report.html"):
-        candidate = base + suffix
-        if os.path.isfile(candidate):
-            html_path = candidate
+        if stem + suffix in present:
+            html_path = base + suffix
 
     score = None
     verdict = None
@@ -344,7 +651,7 @@ def _run_analyzer(logfile, mode="tune", diff_file=None, frame=None, extra_args=N
         actions = state.get("actions", [])
 
     return {
-        "success": result.returncode == 0,
+        "success": returncode == 0,
         "score": score,
         "verdict": verdict,
         "actions": actions,
@@ -358,19 +665,18 @@ def _run_analyzer(logfile, mode="tune", diff_file=None, frame=None, extra_args=N
 
 def _run_param_check(diff_file, frame=None):
     """Run parameter analyzer safety check. Returns (success, output)."""
-    cmd_prefix = _module_cmd(PARAM_MODULE, PARAM_SCRIPT)
-    if not cmd_prefix:
-        return False, f"Cannot find parameter analyzer module"
-
-    cmd = cmd_prefix + [diff_file]
+    argv = [diff_file]
     if frame:
-        cmd.extend(["--frame", str(frame)])
+        argv.extend(["--frame", str(frame)])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        return result.returncode == 0, result.stdout + result.stderr
+        ran = _run_tool(PARAM_MODULE, PARAM_SCRIPT, argv, timeout=30)
     except Exception as e:
         return False, str(e)
+    if ran is None:
+        return False, f"Cannot find parameter analyzer module"
+    returncode, output = ran
+    return returncode == 0, output
 
 
 # ─── Backup & Restore ─────────────────────────────────────────────────────────
@@ -403,25 +709,27 @@ def _create_backup(fc, info, output_dir="./blackbox"):
         return None, None
 
     # Count settings to sanity-check the diff
-    set_lines = [l for l in diff_raw.splitlines() if l.strip().startswith("set ")]
-    if len(set_lines) < 5:
-        print(f"  {RED}FAILED: Config looks incomplete ({len(set_lines)} settings).{R}")
+    n_settings = _count_set_lines(diff_raw)
+    if n_settings < 5:
+        print(f"  {RED}FAILED: Config looks incomplete ({n_settings} settings).{R}")
         print(f"  {RED}No changes will be made without a valid backup.{R}")
         return None, None
 
     # Write backup file
     try:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         backup_path = os.path.join(output_dir, backup_name)
-        with open(backup_path, "w") as f:
-            f.write(f"# INAV Toolkit backup - {craft}\n")
-            f.write(f"# Created: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Firmware: {info.get('firmware', 'unknown')}\n")
-            f.write(f"# Board: {info.get('board_id', 'unknown')}\n")
-            f.write(f"# To restore: paste this entire file in the INAV CLI tab\n")
-            f.write(f"# after running 'defaults' (or use the toolkit's restore).\n")
-            f.write(f"#\n")
-            f.write(diff_raw)
+        with open(backup_path, "w", buffering=IO_BUFFER) as f:
+            f.write("".join((
+                f"# INAV Toolkit backup - {craft}\n",
+                f"# Created: {time.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                f"# Firmware: {info.get('firmware', 'unknown')}\n",
+                f"# Board: {info.get('board_id', 'unknown')}\n",
+                f"# To restore: paste this entire file in the INAV CLI tab\n",
+                f"# after running 'defaults' (or use the toolkit's restore).\n",
+                f"#\n",
+                diff_raw,
+            )))
         # Verify write
         verify_size = os.path.getsize(backup_path)
         if verify_size < len(diff_raw):
@@ -432,13 +740,66 @@ def _create_backup(fc, info, output_dir="./blackbox"):
         return None, None
 
     print(f"  {G}Backup saved: {backup_path}{R}")
-    print(f"  {DIM}({len(set_lines)} settings, {verify_size:,} bytes){R}")
+    print(f"  {DIM}({n_settings} settings, {verify_size:,} bytes){R}")
     print(f"  {Y}Keep this file safe. If anything goes wrong, paste it in{R}")
     print(f"  {Y}the INAV Configurator CLI tab after running 'defaults'.{R}")
 
     return backup_path, diff_raw
 
 
+def _port_present(msp, port_path):
+    """True if the serial port node currently exists."""
+    if os.name == "posix":
+        return os.path.exists(port_path)
+    return port_path in msp.find_serial_ports()
+
+
+def _reconnect_after_reboot(msp, port_path, timeout=15.0):
+    """Poll for the FC to come back on port_path after a reboot.
+
+    USB boards drop off the bus while rebooting, so first wait (up to 3s)
+    for the port to vanish - otherwise we could reopen the node before the
+    reboot has happened. Then poll every 100ms until the port is back and
+    answers a short MSP probe.
+
+    Returns an open INAVDevice, or None after timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    gone_by = min(deadline, time.monotonic() + 3.0)
+    while time.monotonic() < gone_by and _port_present(msp, port_path):
+        time.sleep(0.1)
+
+    while time.monotonic() < deadline:
+        if _port_present(msp, port_path):
+            dev = msp.INAVDevice(port_path, timeout=0.5)
+            try:
+                dev.open()
+                info = dev.get_info()
+                if info and info.get("fc_variant") == "INAV":
+                    # Probe passed - back to normal timeouts for the restore
+                    dev.timeout = dev._ser.timeout = dev._ser.write_timeout = 2.0
+                    return dev
+            except Exception:
+                pass
+            dev.close()
+        time.sleep(0.1)
+    return None
+
+
+# INAVDevice attributes that change when the connection is reopened
+_DEVICE_STATE = ("port_path", "baudrate", "timeout", "_ser", "_info", "_rxbuf")
+
+
+def _adopt_connection(fc, fc_new):
+    """Point the caller's device at the connection _restore_backup reopened.
+
+    No-op when there is no new device or it is fc itself.
+    """
+    if fc_new and fc_new is not fc:
+        for attr in _DEVICE_STATE:
+            setattr(fc, attr, getattr(fc_new, attr))
+
+
 def _restore_backup(fc, info, backup_path, port=None):
     """Restore FC to backup state: defaults + replay diff.
 
@@ -457,31 +818,32 @@ def _restore_backup(fc, info, backup_path, port=None):
     Returns:
         (new_fc, success) - new device object and success flag
     """
-    # Read backup
+    # Read backup, keeping CLI commands (skip comments, empty lines)
+    cli_lines = []
+    set_count = 0
     try:
         with open(backup_path, "r") as f:
-            backup_text = f.read()
+            for line in f:
+                line = line.strip()
+                if not line or line[0] == "#":
+                    continue
+                cli_lines.append(line)
+                if line.startswith("set "):
+                    set_count += 1
     except Exception as e:
         print(f"  {RED}Cannot read backup file: {e}{R}")
         return fc, False
 
-    # Extract CLI commands (skip comments, empty lines)
-    cli_lines = []
-    for line in backup_text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        cli_lines.append(line)
-
     if not cli_lines:
         print(f"  {RED}Backup file is empty or contains only comments.{R}")
         return fc, False
 
-    set_count = len([l for l in cli_lines if l.startswith("set ")])
-    print(f"\n  {B}Restoring from backup: {os.path.basename(backup_path)}{R}")
-    print(f"  {DIM}({set_count} settings to restore){R}")
-    print(f"\n  {Y}WARNING: This will reset ALL settings to defaults,{R}")
-    print(f"  {Y}then restore from backup. The FC will reboot.{R}")
+    _write_lines([
+        f"\n  {B}Restoring from backup: {os.path.basename(backup_path)}{R}",
+        f"  {DIM}({set_count} settings to restore){R}",
+        f"\n  {Y}WARNING: This will reset ALL settings to defaults,{R}",
+        f"  {Y}then restore from backup. The FC will reboot.{R}",
+    ])
 
     if not _confirm(f"\n  Proceed with full restore?", default=False):
         print(f"  Restore cancelled.")
@@ -501,7 +863,7 @@ def _restore_backup(fc, info, backup_path, port=None):
             ser.read(ser.in_waiting)
         # Send defaults
         ser.write(b"defaults\n")
-        time.sleep(0.5)
+        time.sleep(0.3)
         print(f" FC is rebooting...")
     except Exception as e:
         print(f" {RED}failed: {e}{R}")
@@ -517,63 +879,43 @@ def _restore_backup(fc, info, backup_path, port=None):
 
     # Step 2: Wait for reboot and reconnect
     print(f"  Waiting for FC to reboot...", end="", flush=True)
-    time.sleep(5)
 
-    try:
-        from inav_toolkit.msp import INAVDevice, auto_detect_fc
-    except ImportError:
-        try:
-            from inav_msp import INAVDevice, auto_detect_fc
-        except ImportError:
-            print(f" {RED}cannot import MSP module{R}")
-            return None, False
+    msp = _load_msp()
+    if msp is None:
+        print(f" {RED}cannot import MSP module{R}")
+        return None, False
 
-    # Try reconnecting several times
-    new_fc = None
-    for attempt in range(6):
-        try:
-            new_fc = INAVDevice(port_path)
-            new_fc.open()
-            new_info = new_fc.get_info()
-            if new_info and new_info.get("fc_variant") == "INAV":
-                print(f" {G}reconnected{R}")
-                break
-            new_fc.close()
-            new_fc = None
-        except Exception:
-            new_fc = None
-        time.sleep(2)
-        print(".", end="", flush=True)
-
-    if not new_fc:
-        print(f" {RED}could not reconnect{R}")
-        print(f"\n  {RED}FC was reset to defaults but config was NOT restored.{R}")
-        print(f"  {Y}To restore manually:{R}")
-        print(f"    1. Open INAV Configurator")
-        print(f"    2. Go to CLI tab")
-        print(f"    3. Paste contents of: {backup_path}")
-        print(f"    4. Type 'save'")
+    new_fc = _reconnect_after_reboot(msp, port_path)
+    if new_fc:
+        print(f" {G}reconnected{R}")
+    else:
+        _write_lines([
+            f" {RED}could not reconnect{R}",
+            f"\n  {RED}FC was reset to defaults but config was NOT restored.{R}",
+            f"  {Y}To restore manually:{R}",
+            f"    1. Open INAV Configurator",
+            f"    2. Go to CLI tab",
+            f"    3. Paste contents of: {backup_path}",
+            f"    4. Type 'save'",
+        ])
         return None, False
 
     # Step 3: Replay backup config
     print(f"  Restoring {set_count} settings...", end="", flush=True)
     try:
-        results = new_fc.cli_batch(cli_lines, timeout=5.0, save=True)
+        results = new_fc.cli_batch(cli_lines, timeout=5.0, save=True,
+                                   chunk_size=CLI_CHUNK_SIZE)
         # Check for errors
-        errors = []
-        for cmd, response in results:
-            if cmd == "save":
-                continue
-            if "invalid" in response.lower():
-                errors.append(cmd)
+        errors = [cmd for cmd, response in results
+                  if cmd != "save" and _CLI_INVALID_RE.search(response)]
 
         if errors:
-            print(f" {Y}done with {len(errors)} warnings{R}")
-            print(f"  {DIM}Unrecognized settings (may be version-specific):{R}")
-            for cmd in errors[:5]:
-                print(f"    {DIM}{cmd}{R}")
+            lines = [f" {Y}done with {len(errors)} warnings{R}",
+                     f"  {DIM}Unrecognized settings (may be version-specific):{R}"]
+            lines.extend(f"    {DIM}{cmd}{R}" for cmd in errors[:5])
             if len(errors) > 5:
-                print(f"    {DIM}...and {len(errors) - 5} more{R}")
+                lines.append(f"    {DIM}...and {len(errors) - 5} more{R}")
+            _write_lines(lines)
         else:
             print(f" {G}done{R}")
 
@@ -592,18 +934,21 @@ def _extract_cli_commands(actions):
     Returns list of 'set param = value' strings.
     """
     commands = []
+    seen = set()
     for a in actions:
         action_text = a.get("action", "")
         # Match patterns like "set mc_p_roll = 28" within the action text
-        matches = re.findall(r"set\s+\S+\s*=\s*\S+", action_text)
-        commands.extend(matches)
+        for cmd in _SET_CMD_RE.findall(action_text):
+            commands.append(cmd)
+            seen.add(cmd)
         # Also check param/new fields
         param = a.get("param", "")
         new_val = a.get("new", "")
         if param and new_val:
             cmd = f"set {param} = {new_val}"
-            if cmd not in commands:
+            if cmd not in seen:
                 commands.append(cmd)
+                seen.add(cmd)
     return commands
 
 
@@ -617,14 +962,10 @@ def _apply_commands(fc, commands):
         print(f"    {C}{cmd}{R}")
 
     try:
-        results = fc.cli_batch(commands, save=True)
+        results = fc.cli_batch(commands, save=True, chunk_size=CLI_CHUNK_SIZE)
         # Check for errors
-        errors = []
-        for cmd, response in results:
-            if cmd == "save":
-                continue
-            if "invalid" in response.lower() or "error" in response.lower():
-                errors.append((cmd, response))
+        errors = [(cmd, response) for cmd, response in results
+                  if cmd != "save" and _CLI_ERROR_RE.search(response)]
 
         if errors:
             print(f"\n  {Y}Some commands had issues:{R}")
@@ -652,6 +993,31 @@ def _erase_dataflash(fc):
         return False
 
 
+def _erase_dataflash_background(pool, fc):
+    """Start a dataflash erase on a worker thread and return its future.
+
+    The FC erases on its own once the command is sent; the worker only
+    polls for completion, so the pilot can get ready meanwhile. Callers
+    must wait on the future before talking to the FC again.
+    """
+    print(f"\n  Erasing dataflash in the background "
+          f"{DIM}(keep the FC powered until it reports done){R}")
+
+    def _job():
+        try:
+            ok = fc.erase_dataflash(quiet=True)
+        except Exception as e:
+            print(f"\n  {RED}Dataflash erase failed: {e}{R}")
+            return False
+        if ok:
+            print(f"\n  {G}Dataflash erased.{R}")
+        else:
+            print(f"\n  {Y}Dataflash erase not confirmed (flash may still be erasing).{R}")
+        return ok
+
+    return pool.submit(_job)
+
+
 # ─── Result Presentation ─────────────────────────────────────────────────────
 
 def _print_score(score, verdict, prev_score=None):
@@ -682,10 +1048,11 @@ def _print_score(score, verdict, prev_score=None):
             delta = f"  {DIM}+0{R}"
 
     vd = (verdict or "").replace("_", " ").title()
-    print(f"\n  Score: {color}{B}{score}/100{R}{delta}")
-    print(f"  [{bar}]")
+    lines = [f"\n  Score: {color}{B}{score}/100{R}{delta}",
+             f"  [{bar}]"]
     if vd:
-        print(f"  {DIM}{vd}{R}")
+        lines.append(f"  {DIM}{vd}{R}")
+    _write_lines(lines)
 
 
 def _print_actions(actions, deferred=None):
@@ -694,17 +1061,19 @@ def _print_actions(actions, deferred=None):
         print(f"\n  {G}No changes needed - go fly!{R}")
         return
 
+    lines = []
     if actions:
-        print(f"\n  {B}Recommended changes:{R}")
+        lines.append(f"\n  {B}Recommended changes:{R}")
         for i, a in enumerate(actions, 1):
             action = a.get("action", "")
-            print(f"    {C}{i}.{R} {action}")
+            lines.append(f"    {C}{i}.{R} {action}")
 
     if deferred:
-        print(f"\n  {DIM}Deferred (fix filters first, then re-fly):{R}")
+        lines.append(f"\n  {DIM}Deferred (fix filters first, then re-fly):{R}")
         for a in deferred:
             action = a.get("action", a.get("original_action", ""))
-            print(f"    {DIM}  {action}{R}")
+            lines.append(f"    {DIM}  {action}{R}")
+    _write_lines(lines)
 
 
 def _print_nav_summary(output):
@@ -717,9 +1086,9 @@ def _print_nav_summary(output):
 
 # ─── Session Flows ────────────────────────────────────────────────────────────
 
-def _flow_new_build(fc, info):
+def _flow_new_build(fc, info, refresh_diff=False):
     """New build flow: safety check then baseline."""
-    print(f"\n  {B}{C}--- New Build: Safety Check ---{R}")
+    print(_section("New Build: Safety Check"))
 
     # Backup first - before any changes
     backup_path, diff_raw = _create_backup(fc, info)
@@ -729,8 +1098,8 @@ def _flow_new_build(fc, info):
 
     # Save diff to temp file for param analyzer
     diff_path = os.path.join("./blackbox", f"{info.get('craft_name', 'fc')}_diff.txt")
-    os.makedirs("./blackbox", exist_ok=True)
-    with open(diff_path, "w") as f:
+    _ensure_dir("./blackbox")
+    with open(diff_path, "w", buffering=IO_BUFFER) as f:
         f.write(diff_raw)
 
     # Ask frame size
@@ -751,16 +1120,22 @@ def _flow_new_build(fc, info):
         print(f"\n  {G}Config looks good for first flights.{R}")
 
     if _confirm("\n  Ready to analyze a flight?", default=True):
-        _flow_tune_session(fc, info, frame=frame, diff_raw=diff_raw)
+        _flow_tune_session(fc, info, frame=frame, diff_raw=diff_raw,
+                           refresh_diff=refresh_diff)
 
 
-def _flow_tune_session(fc, info, frame=None, diff_raw=None):
+def _flow_tune_session(fc, info, frame=None, diff_raw=None, refresh_diff=False):
     """Tuning session: download, analyze, apply, repeat.
 
     Backup is created before the first change is applied. If the backup
     fails, no changes will be made to the FC. The user can restore to
     the original state at any point during the session.
+
+    The config diff is pulled once and then kept in sync locally with
+    the commands applied; refresh_diff=True re-pulls it every flight.
     """
+    import concurrent.futures
+
     craft = info.get("craft_name", "fc")
     prev_score = None
     session_num = 0
@@ -771,16 +1146,21 @@ def _flow_tune_session(fc, info, frame=None, diff_raw=None):
     # Pull diff if not already available
     if diff_raw is None:
         diff_raw = _pull_diff(fc, output_dir=output_dir, craft_name=craft)
+    # True when the cached diff may no longer match the FC
+    diff_stale = diff_raw is None
 
     # Save diff file path for analyzer
     diff_file = None
     if diff_raw:
         diff_file = os.path.join(output_dir, f"{craft}_diff.txt")
 
+    # Single worker for serial jobs that overlap with pilot think time
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
     try:
         while True:
             session_num += 1
-            print(f"\n  {B}{C}--- Tune: Session {session_num} ---{R}")
+            print(_section(f"Tune: Session {session_num}"))
 
             # Download
             filepath = _download_blackbox(fc, info, output_dir=output_dir)
@@ -836,14 +1216,20 @@ def _flow_tune_session(fc, info, frame=None, diff_raw=None):
                             print(f"  {RED}No changes will be made to the FC.{R}")
                             break
 
-                    _apply_commands(fc, commands)
+                    applied = _apply_commands(fc, commands)
                     changes_applied = True
 
+                    patched = _patch_diff(diff_raw, commands) if applied and diff_raw else None
+                    if patched is None:
+                        diff_stale = True
+                    else:
+                        diff_raw = patched
+                        diff_file = _write_diff(diff_raw, output_dir, craft)
+
                 elif choice == "r":
                     if backup_path and changes_applied:
                         fc_new, ok = _restore_backup(fc, info, backup_path)
-                        if fc_new:
-                            fc.__dict__.update(fc_new.__dict__)
+                        _adopt_connection(fc, fc_new)
                         if ok:
                             print(f"  {G}Restored to original config.{R}")
                     elif not changes_applied:
@@ -856,8 +1242,7 @@ def _flow_tune_session(fc, info, frame=None, diff_raw=None):
                         if _confirm("Restore original config before quitting?",
                                     default=False):
                             fc_new, ok = _restore_backup(fc, info, backup_path)
-                            if fc_new:
-                                fc.__dict__.update(fc_new.__dict__)
+                            _adopt_connection(fc, fc_new)
                     break
 
                 elif choice == "s":
@@ -869,20 +1254,29 @@ def _flow_tune_session(fc, info, frame=None, diff_raw=None):
                     break
 
             # Erase and loop
+            erase_job = None
             if _confirm("\n  Erase dataflash for next flight?", default=True):
-                _erase_dataflash(fc)
+                erase_job = _erase_dataflash_background(pool, fc)
 
             print(f"\n  {B}Go fly!{R}")
             print(f"  When you land, plug back in and press Enter.\n")
             input(f"  {DIM}Press Enter when ready...{R} ")
 
-            # Refresh diff after applying changes
-            diff_raw = _pull_diff(fc, output_dir=output_dir, craft_name=craft)
-            if diff_raw:
-                diff_file = os.path.join(output_dir, f"{craft}_diff.txt")
+            # The erase owns the serial port until it finishes
+            if erase_job is not None:
+                erase_job.result()
+
+            # Refresh diff only if the local copy can't be trusted
+            if diff_stale or refresh_diff:
+                diff_raw = _pull_diff(fc, output_dir=output_dir, craft_name=craft)
+                if diff_raw:
+                    diff_file = os.path.join(output_dir, f"{craft}_diff.txt")
+                diff_stale = diff_raw is None
 
     except KeyboardInterrupt:
         print(f"\n\n  {Y}Session interrupted.{R}")
+    finally:
+        pool.shutdown(wait=True)
 
     # Session end - always remind about backup if changes were made
     if backup_path and changes_applied:
@@ -896,7 +1290,7 @@ def _flow_nav_check(fc, info):
     craft = info.get("craft_name", "fc")
     output_dir = "./blackbox"
 
-    print(f"\n  {B}{C}--- Nav Health Check ---{R}")
+    print(_section("Nav Health Check"))
 
     diff_raw = _pull_diff(fc, output_dir=output_dir, craft_name=craft)
     diff_file = None
@@ -922,7 +1316,7 @@ def _flow_nav_check(fc, info):
 
 def _flow_download_only(fc, info):
     """Just download the blackbox log."""
-    print(f"\n  {B}{C}--- Download Blackbox ---{R}")
+    print(_section("Download Blackbox"))
 
     filepath = _download_blackbox(fc, info)
     if filepath:
@@ -934,32 +1328,33 @@ def _flow_download_only(fc, info):
 
 def _flow_restore(fc, info):
     """Restore from a previous backup file."""
-    print(f"\n  {B}{C}--- Restore Configuration ---{R}")
+    print(_section("Restore Configuration"))
 
     # Find backup files
     backup_dir = "./blackbox"
     craft = info.get("craft_name") or "fc"
-    backups = []
-    if os.path.isdir(backup_dir):
-        for f in sorted(os.listdir(backup_dir), reverse=True):
-            if f.endswith(".txt") and "_backup_" in f:
-                backups.append(os.path.join(backup_dir, f))
+    try:
+        with os.scandir(backup_dir) as it:
+            backups = sorted((e for e in it
+                              if _BACKUP_NAME_RE.search(e.name) and e.is_file()),
+                             key=lambda e: e.name, reverse=True)
+    except OSError:
+        backups = []
 
     if backups:
         print(f"\n  {B}Available backups:{R}")
-        for i, bp in enumerate(backups[:5], 1):
-            mtime = time.strftime("%Y-%m-%d %H:%M",
-                                  time.localtime(os.path.getmtime(bp)))
-            size = os.path.getsize(bp)
-            print(f"    {C}{i}{R}  {os.path.basename(bp)}  "
-                  f"{DIM}({mtime}, {size:,} bytes){R}")
+        for i, entry in enumerate(backups[:5], 1):
+            st = entry.stat()
+            mtime = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+            print(f"    {C}{i}{R}  {entry.name}  "
+                  f"{DIM}({mtime}, {st.st_size:,} bytes){R}")
 
         choice = _prompt("Choose a backup (number) or enter a file path:",
                          default="1")
         try:
             idx = int(choice) - 1
             if 0 <= idx < len(backups):
-                backup_path = backups[idx]
+                backup_path = backups[idx].path
             else:
                 print(f"  {RED}Invalid selection.{R}")
                 return
@@ -973,14 +1368,12 @@ def _flow_restore(fc, info):
         return
 
     fc_new, ok = _restore_backup(fc, info, backup_path)
-    if fc_new and fc_new is not fc:
-        # Update the caller's reference
-        fc.__dict__.update(fc_new.__dict__)
+    _adopt_connection(fc, fc_new)
 
 
 def _flow_offline():
     """Offline analysis: analyze an existing BBL file."""
-    print(f"\n  {B}{C}--- Offline Analysis ---{R}")
+    print(_section("Offline Analysis"))
 
     logfile = _prompt("Path to blackbox log file (.bbl):")
     if not logfile or not os.path.isfile(logfile):
@@ -991,14 +1384,15 @@ def _flow_offline():
                    options=[("t", "PID tuning"), ("n", "Nav health")],
                    default="t")
 
-    diff_file = None
-    # Auto-discover diff
+    # Auto-discover diff (first match wins)
     log_dir = os.path.dirname(os.path.abspath(logfile))
-    candidates = [f for f in os.listdir(log_dir)
-                  if f.endswith("_diff.txt") or f in ("diff.txt", "diff_all.txt")]
-    if candidates:
-        diff_file = os.path.join(log_dir, candidates[0])
-        print(f"  {DIM}Found config: {candidates[0]}{R}")
+    diff_file = None
+    with os.scandir(log_dir) as it:
+        entry = next((e for e in it
+                      if _DIFF_NAME_RE.search(e.name) and e.is_file()), None)
+    if entry:
+        diff_file = entry.path
+        print(f"  {DIM}Found config: {entry.name}{R}")
 
     print(f"\n  Analyzing...\n")
     results = _run_analyzer(logfile,
@@ -1020,7 +1414,7 @@ def _flow_offline():
 
 # ─── Main Entry ───────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
     import argparse
     parser = argparse.ArgumentParser(
         description=f"INAV Toolkit v{VERSION} - Guided Session Manager")
@@ -1029,12 +1423,17 @@ def main():
                         help="Serial port or 'auto' (e.g., /dev/ttyACM0, COM3)")
     parser.add_argument("--no-color", action="store_true",
                         help="Disable colored output")
-    args = parser.parse_args()
+    parser.add_argument("--force-refresh", action="store_true",
+                        help="Re-pull the FC config after every flight instead of "
+                             "tracking applied changes locally")
+    args = parser.parse_args(argv)
 
     if args.no_color:
         global R, B, C, G, Y, RED, DIM
         R = B = C = G = Y = RED = DIM = ""
 
+    # Import pyserial + MSP while the banner and first prompt are up
+    threading.Thread(target=_load_msp, daemon=True).start()
     _banner()
 
     # Try to connect to FC
@@ -1047,7 +1446,15 @@ def main():
         # Ask if FC is connected
         has_fc = _confirm("Is your flight controller connected via USB?", default=True)
         if has_fc:
-            fc, info = _connect_fc("auto")
+            # Try last run's port before scanning every serial port
+            last_port = _read_last_port()
+            msp = _load_msp() if last_port else None
+            if msp and _port_present(msp, last_port):
+                fc, info = _connect_fc(last_port)
+            if not fc:
+                fc, info = _connect_fc("auto")
+            if fc:
+                _remember_port(fc.port_path)
 
     if fc and info:
         _print_fc_info(info)
@@ -1064,11 +1471,11 @@ def main():
                            default="1")
 
             if mode == "1":
-                _flow_tune_session(fc, info)
+                _flow_tune_session(fc, info, refresh_diff=args.force_refresh)
             elif mode == "2":
                 _flow_nav_check(fc, info)
             elif mode == "3":
-                _flow_new_build(fc, info)
+                _flow_new_build(fc, info, refresh_diff=args.force_refresh)
             elif mode == "4":
                 _flow_download_only(fc, info)
             elif mode == "5":
@@ -1,5 +1,12 @@
 """Shared pytest fixtures for INAV Toolkit test suite."""
+import contextlib
+import functools
+import importlib
+import inspect
+import io
 import os
+import pickle
+import site
 import subprocess
 import sys
 
@@ -9,6 +16,10 @@ import pytest
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TESTS_DIR = os.path.join(PROJECT_DIR, "tests")
 FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+# Child interpreters skip the user site-packages scan unless this one
+# actually imports from it.
+CHILD_ENV = (None if site.USER_SITE in sys.path
+             else dict(os.environ, PYTHONNOUSERSITE="1"))
 
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
@@ -23,20 +34,79 @@ def fixtures_dir():
     return FIXTURES_DIR
 
 
-def run_module(module, *args, cwd=None):
-    """Run a toolkit module via python -m, return (stdout, stderr, rc)."""
-    result = subprocess.run(
-        [sys.executable, "-m", module, *args],
-        capture_output=True, text=True, cwd=cwd or PROJECT_DIR)
-    return result.stdout, result.stderr, result.returncode
+def call_main(module, *args, input=None):
+    """Call module.main(args) in this process, return (stdout, stderr, rc).
+
+    input, if given, is what main() reads from sys.stdin. CLIs set the
+    global i18n locale from the environment; it is restored afterwards so
+    later in-process tests still see the locale they expect.
+    """
+    from inav_toolkit import i18n
+    entry = importlib.import_module(module).main
+    out, err = io.StringIO(), io.StringIO()
+    rc = 0
+    saved_stdin, saved_locale = sys.stdin, i18n.get_locale()
+    if input is not None:
+        sys.stdin = io.StringIO(input)
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                entry(list(args))
+            except SystemExit as e:
+                rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.stdin = saved_stdin
+        i18n.set_locale(saved_locale)
+    return out.getvalue(), err.getvalue(), rc
+
 
+def run_cli(*cmd, input=None):
+    """Run a command in a child interpreter, return (stdout, stderr, rc).
 
-def run_entry(cmd, *args, cwd=None):
-    """Run an entry point command, return (stdout, stderr, rc)."""
+    Only for the real process boundary (console scripts, `python -m`);
+    everything else goes through call_main().
+    """
+    stdin_data = input.encode("utf-8") if input is not None else None
     result = subprocess.run(
-        [cmd, *args],
-        capture_output=True, text=True, cwd=cwd or PROJECT_DIR)
-    return result.stdout, result.stderr, result.returncode
+        list(cmd), input=stdin_data,
+        capture_output=True, cwd=PROJECT_DIR, env=CHILD_ENV)
+    return (result.stdout.decode("utf-8", "replace"),
+            result.stderr.decode("utf-8", "replace"), result.returncode)
+
+
+@functools.lru_cache(maxsize=None)
+def _main_output(module, *args):
+    """call_main() memoized per argument list, return (stdout, rc)."""
+    out, _, rc = call_main(module, *args)
+    return out, rc
+
+
+@pytest.fixture(scope="session")
+def main_output():
+    """In-process, memoized call_main() for CLI output checks.
+
+    Each distinct argument list runs once per session.
+    """
+    return _main_output
+
+
+# ─── FFT backend ─────────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="session", autouse=True)
+def _fftw_backend():
+    """Route scipy.fft (and so signal.welch) through FFTW if pyfftw is
+    installed, with its plan cache on for the repeated same-size PSDs.
+    """
+    try:
+        import pyfftw
+        import pyfftw.interfaces.scipy_fft
+        import scipy.fft
+    except ImportError:
+        yield
+        return
+    pyfftw.interfaces.cache.enable()
+    with scipy.fft.set_backend(pyfftw.interfaces.scipy_fft):
+        yield
 
 
 # ─── Lazy-loaded module fixtures ─────────────────────────────────────────────
@@ -57,32 +127,152 @@ def param_module():
 
 # ─── Synthetic flight data fixtures ──────────────────────────────────────────
 
+def _parse_cache_key(csv_path, parser):
+    """What a cached parse depends on: the CSV, the parser's source file
+    and the numpy version that built the arrays."""
+    import numpy as np
+    csv_st = os.stat(csv_path)
+    src_st = os.stat(inspect.getsourcefile(parser))
+    return (csv_st.st_mtime_ns, csv_st.st_size,
+            src_st.st_mtime_ns, src_st.st_size, np.__version__)
+
+
+def _cached_parse(csv_path, parser):
+    """parser(csv_path), memoized to csv_path + ".pkl" across sessions.
+
+    The pickle is reused only while _parse_cache_key() still matches, so
+    editing the CSV, the parser's module or upgrading numpy re-parses.
+    """
+    pkl_path = csv_path + ".pkl"
+    key = _parse_cache_key(csv_path, parser)
+    try:
+        with open(pkl_path, "rb") as f:
+            cached_key, data = pickle.load(f)
+        if cached_key == key:
+            return data
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError, ValueError):
+        pass
+    data = parser(csv_path)
+    # Write-then-rename so parallel (xdist) workers never read a partial file
+    tmp_path = f"{pkl_path}.{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=5)
+        os.replace(tmp_path, pkl_path)
+    except OSError:
+        pass
+    return data
+
+
+# The plain functions below back both the fixtures and the standalone
+# runner in test_smoke.py, which has no pytest fixture machinery.
+
+def _scan_fixture_csvs():
+    """Generated CSV fixtures, file name -> path, from one directory scan."""
+    try:
+        with os.scandir(FIXTURES_DIR) as it:
+            return {e.name: e.path for e in it if e.name.endswith(".csv")}
+    except OSError:
+        return {}
+
+
+def _fixture_csv(fixture_paths, name):
+    return fixture_paths.get(name) or pytest.skip(
+        f"Fixture {name} not found — run generate_fixtures.py")
+
+
+def _parse_fixture(fixture_paths, name):
+    """Parsed data dict of one generated CSV fixture (skips if missing)."""
+    from inav_toolkit import blackbox_analyzer
+    return _cached_parse(_fixture_csv(fixture_paths, name),
+                         blackbox_analyzer.parse_csv_log)
+
+
+def _noise_axes(data):
+    """analyze_noise() on roll/pitch/yaw of a parsed log."""
+    from inav_toolkit import blackbox_analyzer
+    return blackbox_analyzer.analyze_noise_axes(
+        data, [("Roll", "gyro_roll"), ("Pitch", "gyro_pitch"), ("Yaw", "gyro_yaw")],
+        data["sample_rate"])
+
+
+@pytest.fixture(scope="session")
+def fixture_paths():
+    """Generated CSV fixtures, file name -> path, from one directory scan.
+
+    Use ``fixture_paths.get(name) or pytest.skip(...)`` in tests.
+    """
+    return _scan_fixture_csvs()
+
+
 @pytest.fixture(scope="session")
-def clean_hover_data(blackbox_module):
+def clean_hover_data(fixture_paths):
     """Parse the clean hover CSV fixture into a data dict."""
-    csv_path = os.path.join(FIXTURES_DIR, "clean_hover.csv")
-    if not os.path.exists(csv_path):
-        pytest.skip("Fixture clean_hover.csv not found — run generate_fixtures.py")
-    return blackbox_module.parse_csv_log(csv_path)
+    return _parse_fixture(fixture_paths, "clean_hover.csv")
 
 
 @pytest.fixture(scope="session")
-def noisy_motors_data(blackbox_module):
+def noisy_motors_data(fixture_paths):
     """Parse the noisy motors CSV fixture into a data dict."""
-    csv_path = os.path.join(FIXTURES_DIR, "noisy_motors.csv")
-    if not os.path.exists(csv_path):
-        pytest.skip("Fixture noisy_motors.csv not found — run generate_fixtures.py")
-    return blackbox_module.parse_csv_log(csv_path)
+    return _parse_fixture(fixture_paths, "noisy_motors.csv")
 
 
 @pytest.fixture(scope="session")
-def over_tuned_data(blackbox_module):
+def over_tuned_data(fixture_paths):
     """Parse the over-tuned CSV fixture into a data dict."""
-    csv_path = os.path.join(FIXTURES_DIR, "over_tuned.csv")
-    if not os.path.exists(csv_path):
-        pytest.skip("Fixture over_tuned.csv not found — run generate_fixtures.py")
-    return blackbox_module.parse_csv_log(csv_path)
+    return _parse_fixture(fixture_paths, "over_tuned.csv")
+
+
+@pytest.fixture(scope="session")
+def noisy_noise_results(noisy_motors_data):
+    """analyze_noise() on roll/pitch/yaw of the noisy motors fixture."""
+    return _noise_axes(noisy_motors_data)
+
+
+# ─── Flight database fixtures ────────────────────────────────────────────────
+
+def _populate_db(tmpdir):
+    """FlightDB in tmpdir holding five improving TEST_QUAD flights."""
+    import numpy as np
+    from inav_toolkit.flight_db import FlightDB
+    db = FlightDB(os.path.join(tmpdir, "test.db"))
+    # Throwaway database: skip fsync entirely
+    db._connect().execute("PRAGMA synchronous=OFF")
+    # store_flight only reads len() and the last sample: slice one vector
+    time_s = np.arange(3000) / 500.0
+    for i, score in enumerate([55, 62, 68, 75, 80]):
+        plan = {
+            "scores": {
+                "overall": score, "noise": score + 5, "pid": score - 5,
+                "pid_measurable": True, "motor": 80, "gyro_oscillation": score,
+            },
+            "verdict": "OK" if score > 60 else "NEEDS_WORK",
+            "verdict_text": "Test flight",
+            "actions": [],
+            "noise_fingerprint": {"peaks": [], "dominant_source": "clean", "summary": ""},
+        }
+        config = {"craft_name": "TEST_QUAD", "_duration_s": 120 + i * 30,
+                  "_n_motors": 4, "looptime": "1000"}
+        data = {"sample_rate": 500.0, "time_s": time_s[:1000 + i * 500]}
+        hover_osc = [
+            {"axis": "Roll", "severity": "low", "gyro_rms": 3.0 - i * 0.2, "gyro_p2p": 8.0},
+            {"axis": "Pitch", "severity": "low", "gyro_rms": 2.8 - i * 0.15, "gyro_p2p": 7.0},
+            {"axis": "Yaw", "severity": "low", "gyro_rms": 1.5, "gyro_p2p": 4.0},
+        ]
+        db.store_flight(plan, config, data, hover_osc=hover_osc)
+    return db
+
+
+@pytest.fixture(scope="module")
+def populated_db(tmp_path_factory):
+    """FlightDB holding five improving TEST_QUAD flights; yields (db, tmpdir)."""
+    tmpdir = str(tmp_path_factory.mktemp("flightdb"))
+    db = _populate_db(tmpdir)
+    yield db, tmpdir
+    db.close()
+
 
+# ─── Diff fixtures ───────────────────────────────────────────────────────────
 
 @pytest.fixture(scope="session")
 def diff_path():
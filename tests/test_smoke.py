@@ -3,41 +3,62 @@
 INAV Toolkit test suite.
 
 Run:  python3 -m pytest tests/ -v
+  or: python3 -m pytest tests/ -n auto --dist=loadgroup   (parallel, pytest-xdist)
   or: python3 tests/test_smoke.py          (standalone, no pytest needed)
 
+CLI tests call each module's main() in-process (conftest.call_main); only
+the console-script and `python -m` checks start a child interpreter.
+
 Requires: pip install -e ".[test]"
 """
+import functools
 import json
 import os
-import subprocess
+import re
 import sys
+import types
 
-import numpy as np
 import pytest
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
 TESTS_DIR = SCRIPT_DIR
 FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
-sys.path.insert(0, PROJECT_DIR)
+# pytest gets this from pythonpath in pyproject.toml; the standalone runner
+# (and its pool workers, which re-import this file) need it here.
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from conftest import call_main, run_cli  # noqa: E402
 
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
-def run_module(module, *args):
-    """Run a toolkit module via python -m, return (stdout, stderr, rc)."""
-    result = subprocess.run(
-        [sys.executable, "-m", module, *args],
-        capture_output=True, text=True, cwd=PROJECT_DIR)
-    return result.stdout, result.stderr, result.returncode
+@functools.lru_cache(maxsize=None)
+def _diff_fixture(name):
+    """Path of a diff fixture in tests/, or None if missing (stat'ed once).
+
+    Use ``_diff_fixture(name) or pytest.skip(...)`` in tests.
+    """
+    path = os.path.join(TESTS_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _toolkit_entry_points():
+    """Installed console scripts that belong to inav_toolkit, name -> module."""
+    try:
+        from importlib import metadata
+        try:
+            eps = metadata.entry_points(group="console_scripts")
+        except TypeError:  # Python < 3.10
+            eps = metadata.entry_points().get("console_scripts", [])
+    except ImportError:
+        return {}
+    return {ep.name: ep.value.split(":")[0] for ep in eps
+            if ep.value.startswith("inav_toolkit.")}
 
 
-def run_entry(cmd, *args):
-    """Run an entry point command, return (stdout, stderr, rc)."""
-    result = subprocess.run(
-        [cmd, *args],
-        capture_output=True, text=True, cwd=PROJECT_DIR)
-    return result.stdout, result.stderr, result.returncode
+ENTRY_POINTS = _toolkit_entry_points()
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -57,7 +78,7 @@ class TestFilterMath:
     def test_phase_shift(self, ftype, freq, cutoff, expected):
         from inav_toolkit.blackbox_analyzer import _phase_shift
         result = _phase_shift(ftype, freq, cutoff)
-        assert abs(result - expected) < 1.0, f"{ftype} at {freq}Hz: got {result}, expected {expected}"
+        assert result == pytest.approx(expected, abs=1.0)
 
     @pytest.mark.parametrize("q,expected", [
         (0.5,  -90.0),
@@ -66,13 +87,20 @@ class TestFilterMath:
     def test_biquad_at_cutoff(self, q, expected):
         from inav_toolkit.blackbox_analyzer import _phase_shift
         result = _phase_shift("BIQUAD", 100, 100, q=q)
-        assert abs(result - expected) < 0.1
+        assert result == pytest.approx(expected, abs=0.1)
 
     def test_biquad_below_cutoff(self):
         from inav_toolkit.blackbox_analyzer import _phase_shift
         result = _phase_shift("BIQUAD", 10, 100, q=0.5)
         assert abs(result) < 15
 
+    def test_phase_shift_memoized(self):
+        from inav_toolkit.blackbox_analyzer import _phase_shift
+        first = _phase_shift("PT2", 37, 90)
+        hits = _phase_shift.cache_info().hits
+        assert _phase_shift("PT2", 37, 90) == first
+        assert _phase_shift.cache_info().hits == hits + 1
+
     def test_filter_phase_lag_returns_dict(self):
         from inav_toolkit.blackbox_analyzer import estimate_filter_phase_lag
         lag = estimate_filter_phase_lag(65, 50, "PT1")
@@ -84,6 +112,16 @@ class TestFilterMath:
         lag = estimate_filter_phase_lag(0, 50, "PT1")
         assert lag["degrees"] == 0.0 and lag["ms"] == 0.0
 
+    def test_psd_segment_is_fft_friendly(self):
+        import numpy as np
+        from inav_toolkit.blackbox_analyzer import compute_psd
+        # 1237 // 4 = 309 = 3 * 103: the 309-sample segments are kept and
+        # zero-padded to next_fast_len(309) = 315 = 3^2 * 5 * 7
+        sr = 500.0
+        freqs, psd_db = compute_psd(np.sin(2 * np.pi * 80.0 * np.arange(1237) / sr), sr)
+        assert len(freqs) == 315 // 2 + 1
+        assert abs(freqs[np.argmax(psd_db)] - 80.0) < sr / 309
+
 
 # ═════════════════════════════════════════════════════════════════════════════
 # Version Flags
@@ -92,11 +130,21 @@ class TestFilterMath:
 class TestVersionFlags:
     """Verify --version works on all entry points."""
 
-    @pytest.mark.parametrize("entry_point", [
-        "inav-analyze", "inav-params", "inav-msp", "inav-toolkit",
-    ])
-    def test_entry_point_version(self, entry_point):
-        out, _, rc = run_entry(entry_point, "--version")
+    def test_entry_points_report_version(self):
+        """Every console script's main() answers --version (in-process)."""
+        from inav_toolkit import __version__
+        modules = sorted(set(ENTRY_POINTS.values())) or [
+            "inav_toolkit.blackbox_analyzer", "inav_toolkit.msp",
+            "inav_toolkit.param_analyzer", "inav_toolkit.wizard",
+        ]
+        for module in modules:
+            out, _, rc = call_main(module, "--version")
+            assert rc == 0, module
+            assert __version__ in out, module
+
+    def test_entry_point_packaging(self):
+        """One installed console script, end to end."""
+        out, _, rc = run_cli("inav-params", "--version")
         assert rc == 0
         from inav_toolkit import __version__
         assert __version__ in out
@@ -127,6 +175,24 @@ class TestBlackboxImports:
 # Noise Fingerprinting
 # ═════════════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
+def _zero():
+    """Shared read-only one-element array for the fake PSD fields."""
+    import numpy as np
+    zero = np.zeros(1)
+    zero.flags.writeable = False
+    return zero
+
+
+def _mk_noise(axis, peaks, noise_start_freq=120.0, rms=(-20, -15, -10)):
+    """Minimal analyze_noise()-shaped result for fingerprinting tests."""
+    return {
+        "axis": axis, "peaks": peaks, "noise_start_freq": noise_start_freq,
+        "rms_low": rms[0], "rms_mid": rms[1], "rms_high": rms[2],
+        "freqs": _zero(), "psd_db": _zero(),
+    }
+
+
 class TestNoiseFingerprinting:
 
     def test_empty_results(self):
@@ -136,27 +202,16 @@ class TestNoiseFingerprinting:
         assert result["peaks"] == []
 
     def test_with_peaks(self):
+        """Every classified peak carries its source, detail and a remedy."""
         from inav_toolkit.blackbox_analyzer import fingerprint_noise
         fake_noise = [
-            {
-                "axis": "Roll",
-                "peaks": [
-                    {"freq_hz": 160.0, "power_db": -8.0, "prominence": 15.0},
-                    {"freq_hz": 55.0, "power_db": -15.0, "prominence": 10.0},
-                ],
-                "noise_start_freq": 120.0,
-                "rms_low": -20, "rms_mid": -15, "rms_high": -10,
-                "freqs": np.array([0]), "psd_db": np.array([0]),
-            },
-            {
-                "axis": "Pitch",
-                "peaks": [
-                    {"freq_hz": 158.0, "power_db": -9.0, "prominence": 14.0},
-                ],
-                "noise_start_freq": 115.0,
-                "rms_low": -22, "rms_mid": -16, "rms_high": -12,
-                "freqs": np.array([0]), "psd_db": np.array([0]),
-            },
+            _mk_noise("Roll", [
+                {"freq_hz": 160.0, "power_db": -8.0, "prominence": 15.0},
+                {"freq_hz": 55.0, "power_db": -15.0, "prominence": 10.0},
+            ]),
+            _mk_noise("Pitch", [
+                {"freq_hz": 158.0, "power_db": -9.0, "prominence": 14.0},
+            ], noise_start_freq=115.0, rms=(-22, -16, -12)),
             None,
         ]
         result = fingerprint_noise(fake_noise, {"_n_motors": 4})
@@ -165,16 +220,13 @@ class TestNoiseFingerprinting:
         for p in result["peaks"]:
             for key in ("freq_hz", "source", "confidence", "detail"):
                 assert key in p
+            assert p.get("remedy"), f"Peak at {p['freq_hz']}Hz missing remedy field"
 
     def test_prop_harmonics_matching(self):
         from inav_toolkit.blackbox_analyzer import fingerprint_noise
-        fake_noise = [{
-            "axis": "Roll",
-            "peaks": [{"freq_hz": 250.0, "power_db": -5.0, "prominence": 20.0}],
-            "noise_start_freq": 200.0,
-            "rms_low": -30, "rms_mid": -20, "rms_high": -5,
-            "freqs": np.array([0]), "psd_db": np.array([0]),
-        }]
+        fake_noise = [_mk_noise(
+            "Roll", [{"freq_hz": 250.0, "power_db": -5.0, "prominence": 20.0}],
+            noise_start_freq=200.0, rms=(-30, -20, -5))]
         harmonics = [{"harmonic": 1, "min_hz": 200, "max_hz": 300, "label": "fundamental"}]
         result = fingerprint_noise(fake_noise, {"_n_motors": 4}, prop_harmonics=harmonics)
         matched = [p for p in result["peaks"] if p["source"] == "prop_harmonics"]
@@ -183,34 +235,15 @@ class TestNoiseFingerprinting:
 
     def test_cross_axis_structural(self):
         from inav_toolkit.blackbox_analyzer import fingerprint_noise
-        fake_noise = []
-        for axis in ["Roll", "Pitch", "Yaw"]:
-            fake_noise.append({
-                "axis": axis,
-                "peaks": [{"freq_hz": 85.0, "power_db": -12.0, "prominence": 10.0}],
-                "noise_start_freq": 60.0,
-                "rms_low": -18, "rms_mid": -14, "rms_high": -20,
-                "freqs": np.array([0]), "psd_db": np.array([0]),
-            })
+        fake_noise = [
+            _mk_noise(axis, [{"freq_hz": 85.0, "power_db": -12.0, "prominence": 10.0}],
+                      noise_start_freq=60.0, rms=(-18, -14, -20))
+            for axis in ["Roll", "Pitch", "Yaw"]
+        ]
         result = fingerprint_noise(fake_noise, {"_n_motors": 4})
         structural = [p for p in result["peaks"] if p["source"] == "structural"]
         assert len(structural) >= 1
 
-    def test_fingerprint_has_remedies(self):
-        """Enhanced fingerprinting should include remedy suggestions."""
-        from inav_toolkit.blackbox_analyzer import fingerprint_noise
-        fake_noise = [{
-            "axis": "Roll",
-            "peaks": [{"freq_hz": 160.0, "power_db": -8.0, "prominence": 15.0}],
-            "noise_start_freq": 120.0,
-            "rms_low": -20, "rms_mid": -15, "rms_high": -10,
-            "freqs": np.array([0]), "psd_db": np.array([0]),
-        }]
-        result = fingerprint_noise(fake_noise, {"_n_motors": 4})
-        for p in result["peaks"]:
-            assert "remedy" in p, f"Peak at {p['freq_hz']}Hz missing remedy field"
-            assert len(p["remedy"]) > 0
-
 
 # ═════════════════════════════════════════════════════════════════════════════
 # RPM / Prop Harmonics
@@ -259,13 +292,25 @@ class TestFrameProfiles:
 # Filter Recommendation Engine
 # ═════════════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
+def _synth_freqs():
+    """Synthetic PSD axis shared by the tests below (read-only; copy the PSD
+    before shaping it). Kept float64 to match what analyze_noise() produces.
+    """
+    import numpy as np
+    freqs = np.linspace(0, 250, 500)
+    freqs.flags.writeable = False
+    return freqs
+
+
 class TestFilterRecommendation:
 
     def test_compute_recommended_filter_basic(self):
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import compute_recommended_filter, get_frame_profile
-        freqs = np.linspace(0, 250, 500)
+        freqs = _synth_freqs()
         psd = np.full_like(freqs, -45.0)
-        psd[freqs > 80] = -20.0
+        psd[np.searchsorted(freqs, 80, side="right"):] = -20.0  # freqs > 80
 
         noise_results = [{
             "axis": "Roll", "freqs": freqs, "psd_db": psd,
@@ -279,8 +324,9 @@ class TestFilterRecommendation:
         assert 40 <= result <= 90
 
     def test_clean_spectrum_no_change(self):
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import compute_recommended_filter, get_frame_profile
-        freqs = np.linspace(0, 250, 500)
+        freqs = _synth_freqs()
         psd = np.full_like(freqs, -50.0)
         noise_results = [{
             "axis": "Roll", "freqs": freqs, "psd_db": psd,
@@ -294,8 +340,9 @@ class TestFilterRecommendation:
 
     def test_compute_filter_recommendations(self):
         """Comprehensive filter recommendation with notch suggestions."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import compute_filter_recommendations, get_frame_profile
-        freqs = np.linspace(0, 250, 500)
+        freqs = _synth_freqs()
         psd = np.full_like(freqs, -45.0)
         spike_idx = np.argmin(np.abs(freqs - 160))
         psd[spike_idx - 2:spike_idx + 3] = -5.0
@@ -316,72 +363,347 @@ class TestFilterRecommendation:
 # Param Analyzer
 # ═════════════════════════════════════════════════════════════════════════════
 
+@pytest.mark.xdist_group("param-cli")
 class TestParamAnalyzer:
 
-    @pytest.mark.parametrize("frame_size", ["5", "7", "10"])
-    def test_setup_mode(self, frame_size):
-        out, err, rc = run_module("inav_toolkit.param_analyzer", "--setup", frame_size, "--voltage", "6S")
-        assert rc == 0
-        assert "mc_p_roll" in out.lower() or "set mc_p_roll" in out.lower()
+    def test_setup_mode(self):
+        for frame_size in ("5", "7", "10"):
+            out, _, rc = call_main("inav_toolkit.param_analyzer", "--setup", frame_size,
+                                   "--voltage", "6S")
+            assert rc == 0, f"--setup {frame_size}"
+            assert "mc_p_roll" in out.lower(), f"--setup {frame_size}"
 
     def test_setup_json(self):
-        out, err, rc = run_module("inav_toolkit.param_analyzer", "--setup", "10", "--json")
-        assert rc == 0
-        data = json.loads(out)
+        from inav_toolkit.param_analyzer import generate_setup_config, setup_json
+        data = json.loads(json.dumps(setup_json(generate_setup_config(10, voltage="4S"))))
         assert isinstance(data, dict)
+        assert data["frame_inches"] == 10
+
+    def test_setup_cli(self):
+        """The real `python -m` boundary, once."""
+        out, _, rc = run_cli(sys.executable, "-m", "inav_toolkit.param_analyzer",
+                             "--setup", "10")
+        assert rc == 0
+        assert "mc_p_roll" in out.lower()
 
-    def test_diff_analysis(self):
-        diff_path = os.path.join(TESTS_DIR, "test_basic_diff.txt")
-        if not os.path.exists(diff_path):
-            pytest.skip("Fixture not found")
-        out, err, rc = run_module("inav_toolkit.param_analyzer", diff_path)
+    def test_diff_analysis(self, main_output):
+        diff_path = _diff_fixture("test_basic_diff.txt") or pytest.skip("Fixture not found")
+        out, rc = main_output("inav_toolkit.param_analyzer", diff_path)
         assert rc == 0
         assert "SUMMARY" in out
 
+    def test_missing_diff_file(self, main_output):
+        out, rc = main_output("inav_toolkit.param_analyzer", "/nonexistent_diff.txt")
+        assert rc == 1
+        assert "not found" in out
+
+    def test_parse_lines_matches_text(self):
+        from inav_toolkit.param_analyzer import parse_diff_all, parse_diff_all_lines
+        diff_path = _diff_fixture("test_basic_diff.txt") or pytest.skip("Fixture not found")
+        with open(diff_path, "r", errors="replace") as f:
+            text = f.read()
+        with open(diff_path, "r", errors="replace") as f:
+            streamed = parse_diff_all_lines(f)
+        parsed = parse_diff_all(text)
+        assert parsed.pop("raw_text") == text
+        assert streamed == parsed
+
 
 # ═════════════════════════════════════════════════════════════════════════════
 # VTOL Configurator
 # ═════════════════════════════════════════════════════════════════════════════
 
+@pytest.mark.xdist_group("vtol-cli")
 class TestVTOLConfigurator:
 
-    def test_non_vtol_diff(self):
-        diff_path = os.path.join(TESTS_DIR, "test_basic_diff.txt")
-        if not os.path.exists(diff_path):
-            pytest.skip("Fixture not found")
-        out, err, rc = run_module("inav_toolkit.vtol_configurator", diff_path)
+    def test_non_vtol_diff(self, main_output):
+        diff_path = _diff_fixture("test_basic_diff.txt") or pytest.skip("Fixture not found")
+        _, rc = main_output("inav_toolkit.vtol_configurator", diff_path)
+        out, rc_json = main_output("inav_toolkit.vtol_configurator", diff_path, "--json")
         assert rc == 0
+        assert rc_json == 0
+        assert isinstance(json.loads(out), list)
 
-    def test_vtol_analysis(self):
-        diff_path = os.path.join(TESTS_DIR, "test_vtol_diff.txt")
-        if not os.path.exists(diff_path):
-            pytest.skip("Fixture not found")
-        out, err, rc = run_module("inav_toolkit.vtol_configurator", diff_path)
+    def test_vtol_analysis(self, main_output):
+        diff_path = _diff_fixture("test_vtol_diff.txt") or pytest.skip("Fixture not found")
+        out, rc = main_output("inav_toolkit.vtol_configurator", diff_path)
         assert rc == 0
         assert "TRICOPTER" in out
 
     def test_vtol_json(self):
-        diff_path = os.path.join(TESTS_DIR, "test_vtol_diff.txt")
-        if not os.path.exists(diff_path):
-            pytest.skip("Fixture not found")
-        out, err, rc = run_module("inav_toolkit.vtol_configurator", diff_path, "--json")
-        assert rc == 0
-        data = json.loads(out)
+        from inav_toolkit.vtol_configurator import findings_json, parse_diff_all, run_vtol_checks
+        diff_path = _diff_fixture("test_vtol_diff.txt") or pytest.skip("Fixture not found")
+        with open(diff_path, "r", errors="replace") as f:
+            findings = run_vtol_checks(parse_diff_all(f.read()))
+        data = json.loads(json.dumps(findings_json(findings)))
         assert isinstance(data, list)
 
+    def test_missing_diff_file(self, main_output):
+        out, rc = main_output("inav_toolkit.vtol_configurator", "/nonexistent_diff.txt")
+        assert rc == 1
+        assert "not found" in out
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# Wizard
+# ═════════════════════════════════════════════════════════════════════════════
+
+class _FakeClock:
+    """Stand-in for the time module: sleep() advances monotonic() instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _FakeMSP:
+    """msp module stand-in whose INAVDevice records when it was opened."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.opened_at = []
+        outer = self
+
+        class INAVDevice:
+            def __init__(self, port, timeout=2.0):
+                self.port_path, self.timeout = port, timeout
+                self._ser = types.SimpleNamespace(timeout=timeout, write_timeout=timeout)
+
+            def open(self):
+                outer.opened_at.append(outer.clock.now)
+
+            def get_info(self):
+                return {"fc_variant": "INAV"}
+
+            def close(self):
+                pass
+
+        self.INAVDevice = INAVDevice
+
+
+class TestWizard:
+
+    # Master settings, two control profiles, then the closing profile
+    # re-selection that `diff all` ends with; {active} picks the profile
+    _PROFILE_DIFF = (
+        "# diff all\n"
+        "set looptime = 500\n"
+        "# control_profile 1\n"
+        "control_profile 1\n"
+        "set mc_p_pitch = 44\n"
+        "# control_profile 2\n"
+        "control_profile 2\n"
+        "set mc_p_roll = 50\n"
+        "# restore original profile selection\n"
+        "control_profile {active}\n"
+        "mixer_profile 1\n"
+        "battery_profile 1\n"
+        "save"
+    )
+
+    def test_patch_diff_respects_active_profile(self):
+        from inav_toolkit.param_analyzer import parse_diff_all
+        from inav_toolkit.wizard import _patch_diff
+        diff = self._PROFILE_DIFF.format(active=1)
+
+        # Only set in inactive profile 2: profile 1 holds the default
+        assert _patch_diff(diff, ["set mc_p_roll = 40"]) is None
+
+        patched = _patch_diff(diff, ["set mc_p_pitch = 40", "set looptime = 1000"])
+        parsed = parse_diff_all(patched)
+        assert parsed["control_profiles"][1]["mc_p_pitch"] == 40
+        assert parsed["control_profiles"][2]["mc_p_roll"] == 50
+        assert parsed["master"]["looptime"] == 1000
+
+        patched = _patch_diff(self._PROFILE_DIFF.format(active=2), ["set mc_p_roll = 40"])
+        assert parse_diff_all(patched)["control_profiles"][2]["mc_p_roll"] == 40
+
+    def test_patch_diff_inserts_new_setting_as_global(self):
+        from inav_toolkit.param_analyzer import parse_diff_all
+        from inav_toolkit.wizard import _patch_diff
+        patched = _patch_diff(self._PROFILE_DIFF.format(active=1), ["set gyro_main_lpf_hz = 90"])
+        assert parse_diff_all(patched)["master"]["gyro_main_lpf_hz"] == 90
+
+    def _in_home(self, home, fn):
+        """fn() with HOME pointed at home and no XDG_CACHE_HOME."""
+        saved = {k: os.environ.get(k) for k in ("HOME", "XDG_CACHE_HOME")}
+        os.environ["HOME"] = str(home)
+        os.environ.pop("XDG_CACHE_HOME", None)
+        try:
+            return fn()
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+    def test_last_port_round_trip_and_expiry(self, tmp_path):
+        import time
+        from inav_toolkit import wizard
+        cache = tmp_path / ".cache" / "inav-toolkit" / "last_port"
+
+        assert self._in_home(tmp_path, wizard._read_last_port) is None  # missing
+        self._in_home(tmp_path, lambda: wizard._remember_port("/dev/ttyACM1"))
+        assert cache.read_text() == "/dev/ttyACM1\n"
+        assert self._in_home(tmp_path, wizard._read_last_port) == "/dev/ttyACM1"
+
+        stale = time.time() - wizard.LAST_PORT_MAX_AGE - 60
+        os.utime(cache, (stale, stale))
+        assert self._in_home(tmp_path, wizard._read_last_port) is None
+
+    def test_last_port_corrupt_or_unwritable_cache(self, tmp_path):
+        from inav_toolkit import wizard
+        cache_dir = tmp_path / ".cache" / "inav-toolkit"
+        cache_dir.mkdir(parents=True)
+        cache = cache_dir / "last_port"
+        for junk in (b"", b"\n\n", b"\xff\xfe\x00\x81"):
+            cache.write_bytes(junk)
+            assert self._in_home(tmp_path, wizard._read_last_port) is None, junk
+
+        # A file where the cache directory should be: saving is best-effort
+        blocked = tmp_path / "blocked"
+        (blocked / ".cache").mkdir(parents=True)
+        (blocked / ".cache" / "inav-toolkit").write_text("not a directory")
+        self._in_home(blocked, lambda: wizard._remember_port("/dev/ttyACM1"))
+        assert self._in_home(blocked, wizard._read_last_port) is None
+
+    def _reconnect(self, present):
+        """_reconnect_after_reboot() on a fake clock; present(t) is the port list check."""
+        from inav_toolkit import wizard
+        clock = _FakeClock()
+        msp = _FakeMSP(clock)
+        saved = wizard.time, wizard._port_present
+        wizard.time = clock
+        wizard._port_present = lambda _msp, port: present(clock.now)
+        try:
+            dev = wizard._reconnect_after_reboot(msp, "/dev/ttyACM0")
+        finally:
+            wizard.time, wizard._port_present = saved
+        return dev, msp.opened_at, clock.now
+
+    def test_reconnect_waits_for_port_to_vanish_and_return(self):
+        dev, opened_at, _ = self._reconnect(lambda t: not 0.5 <= t < 2.0)
+        assert dev is not None and dev._ser.timeout == 2.0
+        # Never reopened the pre-reboot node, reconnected within a poll
+        assert len(opened_at) == 1 and 2.0 <= opened_at[0] < 2.2
+
+    def test_reconnect_when_port_never_vanishes(self):
+        dev, opened_at, _ = self._reconnect(lambda t: True)
+        assert dev is not None
+        # Gave the reboot its 3s to drop the port before reopening
+        assert len(opened_at) == 1 and 3.0 <= opened_at[0] < 3.2
+
+    def test_reconnect_times_out(self):
+        dev, opened_at, now = self._reconnect(lambda t: t < 0.5)
+        assert dev is None
+        assert opened_at == []
+        assert 15.0 <= now < 15.2
+
+    def test_in_process_timeout_survives_broad_except(self):
+        import signal
+        import time
+        from inav_toolkit.wizard import _run_in_process
+        if not hasattr(signal, "SIGALRM"):
+            pytest.skip("SIGALRM not available")
+
+        def main(argv=None):
+            while True:  # like the analyzer's try/except Exception blocks
+                try:
+                    time.sleep(0.05)
+                except Exception:
+                    pass
+
+        sys.modules["_stuck_tool"] = types.SimpleNamespace(main=main)
+        try:
+            with pytest.raises(TimeoutError):
+                _run_in_process("_stuck_tool", [], 1)
+        finally:
+            del sys.modules["_stuck_tool"]
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# MSP CLI
+# ═════════════════════════════════════════════════════════════════════════════
+
+class _FakeCLISerial:
+    """Serial stand-in that answers CLI lines like INAV: echo, output, prompt."""
+
+    def __init__(self, replies, drop=()):
+        self.replies = replies
+        self.drop = set(drop)
+        self.pending = b""
+
+    @property
+    def in_waiting(self):
+        return len(self.pending)
+
+    def read(self, n):
+        data, self.pending = self.pending[:n], self.pending[n:]
+        return data
+
+    def write(self, data):
+        for cmd in data.decode("ascii").splitlines():
+            if cmd in self.drop:
+                continue
+            out = self.replies.get(cmd)
+            reply = cmd + "\r\n" + (out + "\r\n" if out else "") + "# "
+            self.pending += reply.encode("ascii")
+        return len(data)
+
+
+class TestMSPCLI:
+
+    def _device(self, fake):
+        from inav_toolkit.msp import INAVDevice
+        dev = INAVDevice("/dev/null")
+        dev._ser = fake
+        return dev
+
+    def test_chunk_attributes_each_response(self):
+        fake = _FakeCLISerial({
+            "set mc_p_roll = 40": "mc_p_roll set to 40",
+            "set bogus = 1": "###ERROR IN set: INVALID NAME###",
+            "diff profile": "# control_profile 1\r\nset mc_p_pitch = 44",
+            "set mc_i_roll = 60": "mc_i_roll set to 60",
+        })
+        chunk = list(fake.replies)
+        results = self._device(fake)._cli_send_chunk(chunk, timeout=1.0)
+        assert results == [
+            ("set mc_p_roll = 40", "mc_p_roll set to 40"),
+            ("set bogus = 1", "###ERROR IN set: INVALID NAME###"),
+            ("diff profile", "# control_profile 1\nset mc_p_pitch = 44"),
+            ("set mc_i_roll = 60", "mc_i_roll set to 60"),
+        ]
+
+    def test_chunk_survives_dropped_reply(self):
+        import time
+        chunk = [f"set p{i} = {i}" for i in range(4)]
+        fake = _FakeCLISerial({c: c.split()[1] + " set" for c in chunk}, drop=[chunk[1], chunk[3]])
+        t0 = time.monotonic()
+        results = self._device(fake)._cli_send_chunk(chunk, timeout=0.3)
+        # Gives up after one idle timeout, not timeout * len(chunk)
+        assert time.monotonic() - t0 < 0.9
+        assert results == [(chunk[0], "p0 set"), (chunk[1], ""),
+                           (chunk[2], "p2 set"), (chunk[3], "")]
+
 
 # ═════════════════════════════════════════════════════════════════════════════
 # End-to-End Pipeline Tests (using synthetic fixtures)
 # ═════════════════════════════════════════════════════════════════════════════
 
+@pytest.mark.xdist_group("e2e")
 class TestE2EPipeline:
     """End-to-end analysis pipeline tests using synthetic CSV data."""
 
-    def test_parse_clean_hover(self):
+    def test_parse_clean_hover(self, fixture_paths):
         from inav_toolkit.blackbox_analyzer import parse_csv_log
-        csv_path = os.path.join(FIXTURES_DIR, "clean_hover.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
+        csv_path = fixture_paths.get("clean_hover.csv") or pytest.skip("Run generate_fixtures.py first")
         data = parse_csv_log(csv_path)
         assert data["n_rows"] == 4000
         assert abs(data["sample_rate"] - 500.0) < 10.0
@@ -389,26 +711,17 @@ class TestE2EPipeline:
                      "setpoint_roll", "motor0", "motor1"):
             assert key in data
 
-    def test_noise_analysis_clean(self):
-        from inav_toolkit.blackbox_analyzer import parse_csv_log, analyze_noise
-        csv_path = os.path.join(FIXTURES_DIR, "clean_hover.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
-        data = parse_csv_log(csv_path)
+    def test_noise_analysis_clean(self, clean_hover_data):
+        from inav_toolkit.blackbox_analyzer import analyze_noise
+        data = clean_hover_data
         sr = data["sample_rate"]
         roll_noise = analyze_noise(data, "Roll", "gyro_roll", sr)
         assert roll_noise is not None
         strong_peaks = [p for p in roll_noise["peaks"] if p["power_db"] > -10 and p["freq_hz"] > 20]
         assert len(strong_peaks) == 0, f"Clean hover shouldn't have strong peaks above 20Hz: {strong_peaks}"
 
-    def test_noise_analysis_noisy(self):
-        from inav_toolkit.blackbox_analyzer import parse_csv_log, analyze_noise
-        csv_path = os.path.join(FIXTURES_DIR, "noisy_motors.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
-        data = parse_csv_log(csv_path)
-        sr = data["sample_rate"]
-        roll_noise = analyze_noise(data, "Roll", "gyro_roll", sr)
+    def test_noise_analysis_noisy(self, noisy_noise_results):
+        roll_noise = noisy_noise_results[0]
         assert roll_noise is not None
         peak_freqs = [p["freq_hz"] for p in roll_noise["peaks"]]
         found_160 = any(140 <= f <= 180 for f in peak_freqs)
@@ -416,57 +729,44 @@ class TestE2EPipeline:
         assert found_160, f"Expected peak near 160Hz, got: {peak_freqs}"
         assert found_85, f"Expected peak near 85Hz, got: {peak_freqs}"
 
-    def test_full_fingerprint_on_noisy_data(self):
-        from inav_toolkit.blackbox_analyzer import parse_csv_log, analyze_noise, fingerprint_noise
-        csv_path = os.path.join(FIXTURES_DIR, "noisy_motors.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
-        data = parse_csv_log(csv_path)
-        sr = data["sample_rate"]
-        noise_results = []
-        for axis, key in [("Roll", "gyro_roll"), ("Pitch", "gyro_pitch"), ("Yaw", "gyro_yaw")]:
-            noise_results.append(analyze_noise(data, axis, key, sr))
-        fp = fingerprint_noise(noise_results, {"_n_motors": 4})
+    def test_batched_noise_matches_per_axis(self, noisy_motors_data, noisy_noise_results):
+        import numpy as np
+        from inav_toolkit.blackbox_analyzer import analyze_noise
+        sr = noisy_motors_data["sample_rate"]
+        for batched in noisy_noise_results:
+            single = analyze_noise(noisy_motors_data, batched["axis"],
+                                   f"gyro_{batched['axis'].lower()}", sr)
+            np.testing.assert_allclose(batched["psd_db"], single["psd_db"], atol=1e-9)
+            assert batched["peaks"] == single["peaks"]
+
+    def test_full_fingerprint_on_noisy_data(self, noisy_noise_results):
+        from inav_toolkit.blackbox_analyzer import fingerprint_noise
+        fp = fingerprint_noise(noisy_noise_results, {"_n_motors": 4})
         assert fp["dominant_source"] != "none"
         assert len(fp["peaks"]) >= 1
         for p in fp["peaks"]:
             assert "remedy" in p
 
-    def test_short_flight_survives(self):
+    def test_short_flight_survives(self, fixture_paths):
         from inav_toolkit.blackbox_analyzer import parse_csv_log, analyze_noise
-        csv_path = os.path.join(FIXTURES_DIR, "short_flight.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
+        csv_path = fixture_paths.get("short_flight.csv") or pytest.skip("Run generate_fixtures.py first")
         data = parse_csv_log(csv_path)
         assert data["n_rows"] == 600
         sr = data["sample_rate"]
         roll_noise = analyze_noise(data, "Roll", "gyro_roll", sr)
         assert roll_noise is not None
 
-    def test_motor_analysis(self):
-        from inav_toolkit.blackbox_analyzer import parse_csv_log, analyze_motors
-        csv_path = os.path.join(FIXTURES_DIR, "noisy_motors.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
-        data = parse_csv_log(csv_path)
+    def test_motor_analysis(self, noisy_motors_data):
+        from inav_toolkit.blackbox_analyzer import analyze_motors
+        data = noisy_motors_data
         motor_result = analyze_motors(data, data["sample_rate"])
         assert motor_result is not None
         assert "balance_spread_pct" in motor_result
 
-    def test_filter_recommendation_pipeline(self):
-        from inav_toolkit.blackbox_analyzer import (
-            parse_csv_log, analyze_noise, compute_recommended_filter, get_frame_profile
-        )
-        csv_path = os.path.join(FIXTURES_DIR, "noisy_motors.csv")
-        if not os.path.exists(csv_path):
-            pytest.skip("Run generate_fixtures.py first")
-        data = parse_csv_log(csv_path)
-        sr = data["sample_rate"]
-        noise_results = []
-        for axis, key in [("Roll", "gyro_roll"), ("Pitch", "gyro_pitch"), ("Yaw", "gyro_yaw")]:
-            noise_results.append(analyze_noise(data, axis, key, sr))
+    def test_filter_recommendation_pipeline(self, noisy_noise_results):
+        from inav_toolkit.blackbox_analyzer import compute_recommended_filter, get_frame_profile
         profile = get_frame_profile(5)
-        rec = compute_recommended_filter(noise_results, 100, "gyro", profile)
+        rec = compute_recommended_filter(noisy_noise_results, 100, "gyro", profile)
         assert rec is not None
         assert 30 <= rec <= 200
 
@@ -477,113 +777,67 @@ class TestE2EPipeline:
 
 class TestTrendAnalysis:
 
-    def test_trend_data_generation(self):
-        import tempfile
-        from inav_toolkit.flight_db import FlightDB
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db = FlightDB(os.path.join(tmpdir, "test.db"))
-            for i, score in enumerate([55, 62, 68, 75]):
-                plan = {
-                    "scores": {
-                        "overall": score, "noise": score + 5, "pid": score - 5,
-                        "pid_measurable": True, "motor": 80, "gyro_oscillation": score,
-                    },
-                    "verdict": "OK" if score > 60 else "NEEDS_WORK",
-                    "verdict_text": "Test flight",
-                    "actions": [],
-                    "noise_fingerprint": {"peaks": [], "dominant_source": "clean", "summary": ""},
-                }
-                config = {"craft_name": "TEST_QUAD", "_duration_s": 120 + i * 10,
-                          "_n_motors": 4, "looptime": "1000"}
-                data = {"sample_rate": 500.0, "time_s": np.arange(1000 + i * 500) / 500.0}
-                hover_osc = [
-                    {"axis": "Roll", "severity": "low", "gyro_rms": 3.0 - i * 0.3, "gyro_p2p": 8.0},
-                    {"axis": "Pitch", "severity": "low", "gyro_rms": 2.8 - i * 0.2, "gyro_p2p": 7.0},
-                    {"axis": "Yaw", "severity": "low", "gyro_rms": 1.5, "gyro_p2p": 4.0},
-                ]
-                db.store_flight(plan, config, data, hover_osc=hover_osc)
-            prog = db.get_progression("TEST_QUAD")
-            assert prog["trend"] in ("improving", "stable"), f"Got: {prog}"
-            assert len(prog["flights"]) >= 2
-            db.close()
-
-    def test_generate_trend_html(self):
+    def test_trend_data_generation(self, populated_db):
+        db, _ = populated_db
+        prog = db.get_progression("TEST_QUAD")
+        assert prog["trend"] in ("improving", "stable"), f"Got: {prog}"
+        assert len(prog["flights"]) >= 2
+
+    def test_generate_trend_html(self, populated_db):
         """Test HTML trend report generation."""
-        import tempfile
-        from inav_toolkit.flight_db import FlightDB
         try:
             from inav_toolkit.blackbox_analyzer import generate_trend_report
         except ImportError:
             pytest.skip("generate_trend_report not yet implemented")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db = FlightDB(os.path.join(tmpdir, "test.db"))
-            for i, score in enumerate([55, 62, 68, 75, 80]):
-                plan = {
-                    "scores": {
-                        "overall": score, "noise": score + 5, "pid": score - 5,
-                        "pid_measurable": True, "motor": 80, "gyro_oscillation": score,
-                    },
-                    "verdict": "OK",
-                    "verdict_text": "Test flight",
-                    "actions": [],
-                    "noise_fingerprint": {"peaks": [], "dominant_source": "clean", "summary": ""},
-                }
-                config = {"craft_name": "TEST_QUAD", "_duration_s": 120 + i * 30,
-                          "_n_motors": 4, "looptime": "1000"}
-                data = {"sample_rate": 500.0, "time_s": np.arange(1000 + i * 500) / 500.0}
-                hover_osc = [
-                    {"axis": "Roll", "severity": "low", "gyro_rms": 3.0 - i * 0.2, "gyro_p2p": 8.0},
-                    {"axis": "Pitch", "severity": "low", "gyro_rms": 2.8 - i * 0.15, "gyro_p2p": 7.0},
-                    {"axis": "Yaw", "severity": "low", "gyro_rms": 1.5, "gyro_p2p": 4.0},
-                ]
-                db.store_flight(plan, config, data, hover_osc=hover_osc)
-            prog = db.get_progression("TEST_QUAD", limit=20)
-            html_path = os.path.join(tmpdir, "trend.html")
-            generate_trend_report(prog, "TEST_QUAD", html_path)
-            assert os.path.exists(html_path)
-            with open(html_path) as f:
-                html = f.read()
-            assert "TEST_QUAD" in html
-            assert "Score" in html or "score" in html
-            db.close()
+        db, tmpdir = populated_db
+        prog = db.get_progression("TEST_QUAD", limit=20)
+        html_path = os.path.join(tmpdir, "trend.html")
+        generate_trend_report(prog, "TEST_QUAD", html_path)
+        assert os.path.exists(html_path)
+        with open(html_path) as f:
+            html = f.read()
+        assert "TEST_QUAD" in html
+        assert "Score" in html or "score" in html
+
+
+# Line filters for TestSanityCheck's base diff
+_AUX_LINE_RE = re.compile(r"^aux\b.*\n?", re.M)
+_GPS_UART_RE = re.compile(r"^serial 1 2 115200 .*\n?", re.M)
 
 
+@pytest.mark.xdist_group("param-cli")
 class TestSanityCheck:
     """Test pre-flight sanity check engine."""
 
+    _DIFF_HEADER = "# INAV/TESTBOARD 9.0.1 Feb 22 2026 / 12:00:00 (abc123)"
+    _BASE_SETTINGS = {
+        "name": "TEST_QUAD",
+        "platform_type": "MULTIROTOR",
+        "motor_pwm_protocol": "DSHOT300",
+        "failsafe_procedure": "RTH",
+        "mc_p_roll": 40, "mc_p_pitch": 44,
+        "mc_d_roll": 25, "mc_d_pitch": 25,
+        "roll_rate": 50, "pitch_rate": 50, "yaw_rate": 40,
+        "gyro_main_lpf_hz": 110, "dterm_lpf_hz": 110,
+        "looptime": 500,
+    }
+    _DIFF_TAIL = "\n".join([
+        "serial 1 2 115200 57600 0 115200",   # GPS UART by default
+        "serial 0 64 115200 57600 0 115200",  # RX UART
+        "aux 0 0 1 1800 2100",                # ARM mode
+        "aux 1 1 2 1800 2100",                # ANGLE mode
+        "aux 2 11 3 1800 2100",               # RTH mode
+    ])
+
     def _make_diff(self, **overrides):
         """Build a minimal diff all text with overrides."""
-        lines = [
-            "# INAV/TESTBOARD 9.0.1 Feb 22 2026 / 12:00:00 (abc123)",
-        ]
-        settings = {
-            "name": "TEST_QUAD",
-            "platform_type": "MULTIROTOR",
-            "motor_pwm_protocol": "DSHOT300",
-            "failsafe_procedure": "RTH",
-            "mc_p_roll": 40, "mc_p_pitch": 44,
-            "mc_d_roll": 25, "mc_d_pitch": 25,
-            "roll_rate": 50, "pitch_rate": 50, "yaw_rate": 40,
-            "gyro_main_lpf_hz": 110, "dterm_lpf_hz": 110,
-            "looptime": 500,
-        }
-        settings.update(overrides)
-        for k, v in settings.items():
-            if isinstance(v, bool):
-                lines.append(f"set {k} = {'ON' if v else 'OFF'}")
-            else:
-                lines.append(f"set {k} = {v}")
-        # GPS UART by default
-        lines.append("serial 1 2 115200 57600 0 115200")
-        # RX UART
-        lines.append("serial 0 64 115200 57600 0 115200")
-        # ARM mode
-        lines.append("aux 0 0 1 1800 2100")
-        # ANGLE mode
-        lines.append("aux 1 1 2 1800 2100")
-        # RTH mode
-        lines.append("aux 2 11 3 1800 2100")
-        return "\n".join(lines)
+        settings = {**self._BASE_SETTINGS, **overrides}
+        return "\n".join([
+            self._DIFF_HEADER,
+            *(f"set {k} = {('ON' if v else 'OFF') if isinstance(v, bool) else v}"
+              for k, v in settings.items()),
+            self._DIFF_TAIL,
+        ])
 
     def test_good_config_passes(self):
         from inav_toolkit.param_analyzer import parse_diff_all, run_sanity_check, SanityItem
@@ -595,9 +849,7 @@ class TestSanityCheck:
 
     def test_no_arm_switch(self):
         from inav_toolkit.param_analyzer import parse_diff_all, run_sanity_check, SanityItem
-        diff = self._make_diff()
-        # Remove aux lines (no ARM)
-        diff = "\n".join(l for l in diff.splitlines() if not l.startswith("aux"))
+        diff = _AUX_LINE_RE.sub("", self._make_diff())  # no ARM switch
         parsed = parse_diff_all(diff)
         items = run_sanity_check(parsed, interactive=False)
         arm_fails = [i for i in items if i.category == "Arming" and i.status == SanityItem.FAIL]
@@ -645,10 +897,7 @@ class TestSanityCheck:
 
     def test_nav_without_gps_fails(self):
         from inav_toolkit.param_analyzer import parse_diff_all, run_sanity_check, SanityItem
-        diff = self._make_diff()
-        # Remove GPS UART
-        diff = "\n".join(l for l in diff.splitlines()
-                         if not (l.startswith("serial 1") and "2 115200" in l))
+        diff = _GPS_UART_RE.sub("", self._make_diff())  # no GPS UART
         parsed = parse_diff_all(diff)
         items = run_sanity_check(parsed, interactive=False)
         nav_fails = [i for i in items if i.category == "Navigation" and i.status == SanityItem.FAIL]
@@ -663,7 +912,7 @@ class TestSanityCheck:
         assert len(pid_asks) >= 1
 
     def test_json_output(self):
-        out, err, rc = run_module(
+        out, err, rc = call_main(
             "inav_toolkit.param_analyzer", "--check", "--no-interactive",
             "--json", os.path.join(TESTS_DIR, "test_basic_diff.txt"))
         data = json.loads(out)
@@ -673,42 +922,32 @@ class TestSanityCheck:
 
     def test_check_exit_code_clean(self):
         """Good config returns exit code 0."""
-        import tempfile
-        diff = self._make_diff()
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(diff)
-            f.flush()
-            out, err, rc = run_module(
-                "inav_toolkit.param_analyzer", "--check", "--no-interactive", f.name)
-        os.unlink(f.name)
+        out, err, rc = call_main(
+            "inav_toolkit.param_analyzer", "--check", "--no-interactive", "-",
+            input=self._make_diff())
         assert rc == 0, f"Expected rc=0, got {rc}\n{out}"
 
     def test_check_exit_code_bad(self):
         """Bad config returns exit code 1."""
-        import tempfile
-        diff = self._make_diff(failsafe_procedure="DROP", mc_p_roll=0)
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(diff)
-            f.flush()
-            out, err, rc = run_module(
-                "inav_toolkit.param_analyzer", "--check", "--no-interactive", f.name)
-        os.unlink(f.name)
+        out, err, rc = call_main(
+            "inav_toolkit.param_analyzer", "--check", "--no-interactive", "-",
+            input=self._make_diff(failsafe_procedure="DROP", mc_p_roll=0))
         assert rc == 1, f"Expected rc=1, got {rc}\n{out}"
 
 
+@pytest.mark.xdist_group("e2e")
 class TestComparison:
     """Test comparative flight analysis."""
 
-    def test_analyze_for_compare(self):
+    def test_analyze_for_compare(self, fixture_paths):
         """Test the comparison analysis pipeline with synthetic data."""
         from inav_toolkit.blackbox_analyzer import (
             _analyze_for_compare, generate_action_plan, analyze_noise,
             analyze_pid_response, analyze_motors, analyze_dterm_noise,
             detect_hover_oscillation, fingerprint_noise,
         )
-        fixture = os.path.join(FIXTURES_DIR, "clean_hover.csv")
-        if not os.path.exists(fixture):
-            pytest.skip("clean_hover.csv fixture not found (run generate_fixtures.py)")
+        fixture = fixture_paths.get("clean_hover.csv") or pytest.skip(
+            "clean_hover.csv fixture not found (run generate_fixtures.py)")
 
         # Create a minimal args namespace
         class Args:
@@ -726,8 +965,28 @@ class TestComparison:
         assert "pid_results" in result
         assert "data" in result
 
+    def test_analyze_pair_without_worker_process(self):
+        """--compare falls back to serial analysis when no pool can start."""
+        import concurrent.futures
+        from inav_toolkit import blackbox_analyzer as bb
+
+        def no_pool(*args, **kwargs):
+            raise PermissionError("sem_open: permission denied")
+
+        def fake_analyze(logfile, args, config_raw=None):
+            return {"plan": {"scores": {"overall": 50.0}}, "logfile": logfile}
+
+        saved = concurrent.futures.ProcessPoolExecutor, bb._analyze_for_compare
+        concurrent.futures.ProcessPoolExecutor, bb._analyze_for_compare = no_pool, fake_analyze
+        try:
+            res_a, res_b = bb._analyze_pair("a.csv", "b.csv", None, None)
+        finally:
+            concurrent.futures.ProcessPoolExecutor, bb._analyze_for_compare = saved
+        assert (res_a["logfile"], res_b["logfile"]) == ("a.csv", "b.csv")
+
     def test_comparison_noise_chart(self):
         """Test comparison noise overlay chart generation."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import (
             _create_comparison_noise_chart, analyze_noise
         )
@@ -735,7 +994,7 @@ class TestComparison:
         n = 1000
         sr = 500.0
         freqs = np.fft.rfftfreq(256, 1.0 / sr)
-        psd_db = -40 + np.random.randn(len(freqs)) * 5
+        psd_db = -40 + np.random.default_rng(0).standard_normal(len(freqs)) * 5
 
         nr_a = [{"axis": ax, "freqs": freqs, "psd_db": psd_db,
                   "peaks": [{"freq_hz": 150, "power_db": -20}]}
@@ -750,6 +1009,7 @@ class TestComparison:
 
     def test_comparison_html(self):
         """Test comparison HTML generation structure."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _generate_comparison_html
 
         def _make_res(score, logfile="test.bbl"):
@@ -778,37 +1038,44 @@ class TestReplay:
     """Test interactive replay HTML generation."""
 
     def test_downsample(self):
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _downsample
         arr = np.arange(10000)
         ds = _downsample(arr, 1000)
         assert len(ds) <= 1100  # approximately 1000
         assert ds[0] == 0
+        assert ds[-1] == 9999  # keeps the end of the log
 
     def test_downsample_short(self):
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _downsample
         arr = np.arange(50)
         ds = _downsample(arr, 1000)
         assert len(ds) == 50  # no downsampling needed
 
+    def test_compact_json_writes_nan_as_null(self):
+        from inav_toolkit.blackbox_analyzer import _compact_json
+        payload = _compact_json({"gyro": [1.5, float("nan")], "duration": float("inf")})
+        assert payload == '{"gyro":[1.5,null],"duration":null}'
+
     def test_replay_html_generation(self):
         """Test replay HTML output contains expected Plotly.js elements."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _generate_replay_html
 
         n = 2000
         sr = 500.0
+        rng = np.random.default_rng(0)
+        # gyro + setpoint for roll/pitch/yaw, then four motors, in one draw each
+        rates = rng.standard_normal((6, n)) * np.array([[10], [10], [5], [10], [10], [5]])
+        motors = rng.uniform(1000, 2000, (4, n))
         data = {
             "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n) * 10,
-            "gyro_pitch": np.random.randn(n) * 10,
-            "gyro_yaw": np.random.randn(n) * 5,
-            "setpoint_roll": np.random.randn(n) * 10,
-            "setpoint_pitch": np.random.randn(n) * 10,
-            "setpoint_yaw": np.random.randn(n) * 5,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "motor1": np.random.uniform(1000, 2000, n),
-            "motor2": np.random.uniform(1000, 2000, n),
-            "motor3": np.random.uniform(1000, 2000, n),
-            "throttle": np.random.uniform(1000, 1800, n),
+            "gyro_roll": rates[0], "gyro_pitch": rates[1], "gyro_yaw": rates[2],
+            "setpoint_roll": rates[3], "setpoint_pitch": rates[4], "setpoint_yaw": rates[5],
+            "motor0": motors[0], "motor1": motors[1],
+            "motor2": motors[2], "motor3": motors[3],
+            "throttle": rng.uniform(1000, 1800, n),
             "n_rows": n, "sample_rate": sr,
             "_slow_frames": [],
         }
@@ -832,11 +1099,12 @@ class TestReplay:
 
     def test_replay_with_spectrogram(self):
         """Test replay HTML includes noise spectrogram waterfall."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _generate_replay_html, _compute_spectrogram
 
         n = 2000
         sr = 500.0
-        gyro = np.random.randn(n) * 10
+        gyro = np.random.default_rng(0).standard_normal(n) * 10
         data = {
             "time_s": np.arange(n) / sr,
             "gyro_roll": gyro,
@@ -858,6 +1126,7 @@ class TestReplay:
 
     def test_replay_flight_modes(self):
         """Test flight mode extraction from slow frames."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import _extract_flight_modes
 
         sr = 500.0
@@ -879,6 +1148,36 @@ class TestReplay:
 
 
 
+@functools.lru_cache(maxsize=None)
+def _quality_channels(n, sr):
+    """Seeded flight channels for the log-quality tests (shared, read-only)."""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    chans = {
+        "time_s": np.arange(n) / sr,
+        "gyro_roll": rng.standard_normal(n) * 50,
+        "gyro_pitch": rng.standard_normal(n) * 50,
+        "gyro_yaw": rng.standard_normal(n) * 20,
+        "setpoint_roll": rng.standard_normal(n) * 30,
+        "motor0": rng.uniform(1000, 2000, n),
+        "motor1": rng.uniform(1000, 2000, n),
+        "throttle": rng.uniform(1100, 1800, n),
+    }
+    for arr in chans.values():
+        arr.flags.writeable = False
+    return chans
+
+
+def _quality_log(n, sr, *channels, **extra):
+    """assess_log_quality() input: the named cached channels plus extra keys."""
+    base = _quality_channels(n, sr)
+    data = {name: base[name] for name in channels}
+    data.update(extra)
+    data["found_columns"] = [k for k in data if not k.startswith("_")]
+    data.update(time_s=base["time_s"], n_rows=n, sample_rate=sr)
+    return data
+
+
 class TestLogQuality:
     """Tests for log quality scorer."""
 
@@ -886,21 +1185,8 @@ class TestLogQuality:
         """Test that a well-formed log gets GOOD grade."""
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
-        n = 5000
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n) * 50,
-            "gyro_pitch": np.random.randn(n) * 50,
-            "gyro_yaw": np.random.randn(n) * 20,
-            "setpoint_roll": np.random.randn(n) * 30,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "motor1": np.random.uniform(1000, 2000, n),
-            "throttle": np.random.uniform(1100, 1800, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll", "gyro_pitch", "gyro_yaw",
-                              "setpoint_roll", "motor0", "motor1", "throttle"],
-        }
+        data = _quality_log(5000, 500.0, "gyro_roll", "gyro_pitch", "gyro_yaw",
+                            "setpoint_roll", "motor0", "motor1", "throttle")
         q = assess_log_quality(data)
         assert q["usable"] is True
         assert q["grade"] == "GOOD"
@@ -910,15 +1196,7 @@ class TestLogQuality:
         """Test that a very short log is UNUSABLE."""
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
-        n = 100
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll"],
-        }
-        q = assess_log_quality(data)
+        q = assess_log_quality(_quality_log(100, 500.0, "gyro_roll"))
         assert q["grade"] == "UNUSABLE"
         assert q["usable"] is False
         assert any("short" in i["message"] or "only" in i["message"].lower() for i in q["issues"])
@@ -927,15 +1205,7 @@ class TestLogQuality:
         """Test that missing gyro data is UNUSABLE."""
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
-        n = 5000
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["motor0"],
-        }
-        q = assess_log_quality(data)
+        q = assess_log_quality(_quality_log(5000, 500.0, "motor0"))
         assert q["usable"] is False
         assert any("gyro" in i["message"].lower() for i in q["issues"])
 
@@ -943,37 +1213,21 @@ class TestLogQuality:
         """Test that low sample rate is flagged."""
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
-        n = 500
-        sr = 50.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n) * 50,
-            "setpoint_roll": np.random.randn(n) * 30,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "throttle": np.random.uniform(1100, 1800, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll", "setpoint_roll", "motor0", "throttle"],
-        }
+        data = _quality_log(500, 50.0, "gyro_roll", "setpoint_roll", "motor0", "throttle")
         q = assess_log_quality(data)
         assert any("sample rate" in i["message"].lower() for i in q["issues"])
 
     def test_ground_only_detection(self):
         """Test detection of no-flight (ground-only) logs."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
         n = 5000
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n) * 50,
-            "setpoint_roll": np.zeros(n),      # no stick movement
-            "setpoint_pitch": np.zeros(n),
-            "throttle": np.ones(n) * 1000,     # throttle at minimum
-            "motor0": np.random.uniform(1000, 2000, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll", "setpoint_roll", "setpoint_pitch",
-                              "throttle", "motor0"],
-        }
+        still = np.broadcast_to(0.0, n)                   # read-only, no n-sized buffer
+        data = _quality_log(n, 500.0, "gyro_roll", "motor0",
+                            setpoint_roll=still,           # no stick movement
+                            setpoint_pitch=still,
+                            throttle=np.broadcast_to(1000.0, n))  # throttle at minimum
         q = assess_log_quality(data)
         assert any("stick" in i["message"].lower() or "ground" in i["message"].lower()
                     for i in q["issues"])
@@ -982,38 +1236,19 @@ class TestLogQuality:
         """Test corrupt frame detection from decoder stats."""
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
-        n = 5000
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.random.randn(n) * 50,
-            "setpoint_roll": np.random.randn(n) * 30,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "throttle": np.random.uniform(1100, 1800, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll", "setpoint_roll", "motor0", "throttle"],
-            "_decoder_stats": {"i_frames": 100, "p_frames": 200, "errors": 150},
-        }
+        data = _quality_log(5000, 500.0, "gyro_roll", "setpoint_roll", "motor0", "throttle",
+                            _decoder_stats={"i_frames": 100, "p_frames": 200, "errors": 150})
         q = assess_log_quality(data)
         assert any("corrupt" in i["message"].lower() for i in q["issues"])
 
     def test_all_zeros_gyro(self):
         """Test dead sensor detection."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import assess_log_quality
 
         n = 5000
-        sr = 500.0
-        data = {
-            "time_s": np.arange(n) / sr,
-            "gyro_roll": np.zeros(n),
-            "gyro_pitch": np.random.randn(n) * 50,
-            "setpoint_roll": np.random.randn(n) * 30,
-            "motor0": np.random.uniform(1000, 2000, n),
-            "throttle": np.random.uniform(1100, 1800, n),
-            "n_rows": n, "sample_rate": sr,
-            "found_columns": ["gyro_roll", "gyro_pitch", "setpoint_roll",
-                              "motor0", "throttle"],
-        }
+        data = _quality_log(n, 500.0, "gyro_pitch", "setpoint_roll", "motor0", "throttle",
+                            gyro_roll=np.broadcast_to(0.0, n))
         q = assess_log_quality(data)
         assert any("zeros" in i["message"].lower() and "roll" in i["message"].lower()
                     for i in q["issues"])
@@ -1024,6 +1259,7 @@ class TestMarkdownReport:
 
     def test_basic_report(self):
         """Test markdown report contains expected sections."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import generate_markdown_report, get_frame_profile
 
         profile = get_frame_profile(5, 5, 3)
@@ -1064,6 +1300,7 @@ class TestMarkdownReport:
 
     def test_report_with_quality(self):
         """Test markdown report includes quality info when provided."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import generate_markdown_report, get_frame_profile
 
         profile = get_frame_profile(5, 5, 3)
@@ -1083,6 +1320,7 @@ class TestMarkdownReport:
 
     def test_report_with_deferred_actions(self):
         """Test markdown report shows deferred actions separately."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import generate_markdown_report, get_frame_profile
 
         profile = get_frame_profile(5, 5, 3)
@@ -1204,6 +1442,7 @@ class TestI18n:
 
     def test_quality_messages_translated(self):
         """Test that quality scorer messages use t() and translate."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import assess_log_quality
         from inav_toolkit.i18n import set_locale
 
@@ -1211,7 +1450,7 @@ class TestI18n:
         n = 50
         data = {
             "time_s": np.arange(n) / 500.0,
-            "gyro_roll": np.random.randn(n),
+            "gyro_roll": np.random.default_rng(0).standard_normal(n),
             "n_rows": n, "sample_rate": 500.0,
             "found_columns": ["gyro_roll"],
         }
@@ -1225,6 +1464,7 @@ class TestI18n:
 
     def test_markdown_report_translated(self):
         """Test markdown report uses translated section headers."""
+        import numpy as np
         from inav_toolkit.blackbox_analyzer import generate_markdown_report, get_frame_profile
         from inav_toolkit.i18n import set_locale
 
@@ -1244,21 +1484,37 @@ class TestI18n:
         set_locale("en")
 
 
+@functools.lru_cache(maxsize=None)
+def _cruise_gps_frames(n, sr, speed_ms, hz):
+    """GPS slow frames for TestFlightTools._add_gps (shared; treat as read-only)."""
+    frames = []
+    lat0, lon0 = 47.0, 8.0
+    step = int(sr / hz)
+    for i in range(0, n, step):
+        t = i / sr
+        lat = lat0 + (speed_ms * t) / 111320.0
+        frames.append((i, {"GPS_coord[0]": lat * 1e7, "GPS_coord[1]": lon0 * 1e7,
+                           "GPS_speed": speed_ms * 100, "GPS_altitude": 120.0,
+                           "GPS_numSat": 14}))
+    return tuple(frames)
+
+
 class TestFlightTools:
     """Tests for anonymizer, range analysis, and postmortem forensics."""
 
     def _base_data(self, n=3000, sr=100.0):
+        import numpy as np
         rng = np.random.default_rng(42)
         t = np.arange(n) / sr
         data = {
             "n_rows": n, "sample_rate": sr, "time_s": t,
             "gyro_roll": rng.normal(0, 5, n), "gyro_pitch": rng.normal(0, 5, n),
             "gyro_yaw": rng.normal(0, 5, n),
-            "motor0": 1500 + rng.normal(0, 60, n), "motor1": 1500 + rng.normal(0, 60, n),
-            "motor2": 1500 + rng.normal(0, 60, n), "motor3": 1500 + rng.normal(0, 60, n),
+            "motor0": rng.normal(1500, 60, n), "motor1": rng.normal(1500, 60, n),
+            "motor2": rng.normal(1500, 60, n), "motor3": rng.normal(1500, 60, n),
             "throttle": np.full(n, 1500.0),
-            "rc_roll": 1500 + rng.normal(0, 30, n), "rc_pitch": 1500 + rng.normal(0, 30, n),
-            "rc_yaw": 1500 + rng.normal(0, 30, n),
+            "rc_roll": rng.normal(1500, 30, n), "rc_pitch": rng.normal(1500, 30, n),
+            "rc_yaw": rng.normal(1500, 30, n),
             "vbat": np.full(n, 1660.0),                 # 16.6V (4S), 0.01V units
             "amperage": np.full(n, 1000.0),             # 10A, 0.01A units
             "_slow_frames": [], "_gps_frames": [],
@@ -1267,17 +1523,7 @@ class TestFlightTools:
 
     def _add_gps(self, data, sr, speed_ms=10.0, hz=1.0):
         """Northbound cruise at speed_ms; one fix per 1/hz seconds."""
-        n = data["n_rows"]
-        frames = []
-        lat0, lon0 = 47.0, 8.0
-        step = int(sr / hz)
-        for i in range(0, n, step):
-            t = i / sr
-            lat = lat0 + (speed_ms * t) / 111320.0
-            frames.append((i, {"GPS_coord[0]": lat * 1e7, "GPS_coord[1]": lon0 * 1e7,
-                               "GPS_speed": speed_ms * 100, "GPS_altitude": 120.0,
-                               "GPS_numSat": 14}))
-        data["_gps_frames"] = frames
+        data["_gps_frames"] = _cruise_gps_frames(data["n_rows"], sr, speed_ms, hz)
         return data
 
     def test_anonymize_strips_gps_and_name(self, tmp_path):
@@ -1333,6 +1579,7 @@ class TestFlightTools:
         assert "M2" in " ".join(v["evidence"])
 
     def test_postmortem_voltage_collapse(self):
+        import numpy as np
         from inav_toolkit.flight_tools import analyze_postmortem
         sr = 100.0
         data = self._base_data(n=3000, sr=sr)
@@ -1369,46 +1616,155 @@ class TestFlightTools:
 # Standalone runner (works without pytest)
 # ═════════════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=None)
+def _standalone_instance(class_name):
+    """One instance per test class per worker process."""
+    return globals()[class_name]()
+
+
+# Parent for the runner's temporary directories; __main__ removes it
+_STANDALONE_TMP = None
+
+
+def _set_standalone_tmp(path):
+    """Pool initializer: share the runner's temporary parent directory."""
+    global _STANDALONE_TMP
+    _STANDALONE_TMP = path
+
+
+def _standalone_tmpdir():
+    import tempfile
+    return tempfile.mkdtemp(dir=_STANDALONE_TMP)
+
+
+def _standalone_tmp_path(conftest):
+    import pathlib
+    return pathlib.Path(_standalone_tmpdir())
+
+
+def _standalone_populated_db(conftest):
+    tmpdir = _standalone_tmpdir()
+    return conftest._populate_db(tmpdir), tmpdir
+
+
+# conftest fixtures the standalone runner can provide: name -> (factory
+# taking the conftest module, whether one value is shared per worker)
+_STANDALONE_FIXTURES = {
+    "tmp_path": (_standalone_tmp_path, False),
+    "fixture_paths": (lambda c: c._scan_fixture_csvs(), True),
+    "clean_hover_data": (
+        lambda c: c._parse_fixture(_standalone_fixture("fixture_paths"), "clean_hover.csv"),
+        True),
+    "noisy_motors_data": (
+        lambda c: c._parse_fixture(_standalone_fixture("fixture_paths"), "noisy_motors.csv"),
+        True),
+    "noisy_noise_results": (
+        lambda c: c._noise_axes(_standalone_fixture("noisy_motors_data")), True),
+    "populated_db": (_standalone_populated_db, True),
+    "main_output": (lambda c: c._main_output, True),
+}
+
+
+def _standalone_fixture(name):
+    """Value of a conftest fixture outside pytest, built from conftest's
+    plain helpers; shared fixtures are built once per worker process."""
+    factory, shared = _STANDALONE_FIXTURES[name]
+    if not shared:
+        import conftest
+        return factory(conftest)
+    return _shared_standalone_fixture(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_standalone_fixture(name):
+    import conftest
+    return _STANDALONE_FIXTURES[name][0](conftest)
+
+
+def _run_standalone(class_name, method_name):
+    """Run one test method outside pytest, return (status, detail).
+
+    status is "+" (passed), "~" (skipped) or "X" (failed). Like pytest,
+    setup_method/teardown_method run around each test if a class defines
+    them, and the conftest fixtures in _STANDALONE_FIXTURES are supplied.
+    """
+    func = vars(globals()[class_name])[method_name]
+    # Anything beyond self is a parametrize argument or a pytest fixture
+    arg_names = func.__code__.co_varnames[1:func.__code__.co_argcount]
+    if any(name not in _STANDALONE_FIXTURES for name in arg_names):
+        return "~", "parametrized, use pytest"
+    instance = _standalone_instance(class_name)
+    method = getattr(instance, method_name)
+    try:
+        kwargs = {name: _standalone_fixture(name) for name in arg_names}
+        if hasattr(instance, "setup_method"):
+            instance.setup_method(method)
+        try:
+            method(**kwargs)
+        finally:
+            if hasattr(instance, "teardown_method"):
+                instance.teardown_method(method)
+    except (SystemExit, pytest.skip.Exception):
+        return "~", "skipped"
+    except Exception as e:
+        return "X", str(e)
+    return "+", ""
+
+
+# Classes the standalone runner executes, in file order. Add new Test*
+# classes here too (pytest collects them on its own).
+TEST_CLASSES = (
+    TestFilterMath, TestVersionFlags, TestBlackboxImports,
+    TestNoiseFingerprinting, TestRPMEstimation, TestFrameProfiles,
+    TestFilterRecommendation, TestParamAnalyzer, TestVTOLConfigurator,
+    TestWizard, TestMSPCLI, TestE2EPipeline, TestTrendAnalysis, TestSanityCheck,
+    TestComparison, TestReplay, TestLogQuality, TestMarkdownReport, TestI18n,
+    TestFlightTools,
+)
+
+
 if __name__ == "__main__":
+    import concurrent.futures
+    import tempfile
+
     test_items = []
-    for name, obj in sorted(globals().items()):
-        if isinstance(obj, type) and name.startswith("Test"):
-            for method_name in sorted(dir(obj)):
-                if method_name.startswith("test_"):
-                    method = getattr(obj, method_name)
-                    if callable(method):
-                        test_items.append((f"{name}.{method_name}", obj, method_name))
-
-    passed = failed = skipped = 0
+    for cls in TEST_CLASSES:
+        for method_name, member in sorted(vars(cls).items()):
+            if method_name.startswith("test_") and callable(member):
+                test_items.append((cls.__name__, method_name))
+
     print("=" * 60)
     print("  INAV Toolkit -- Test Suite")
     print("=" * 60)
 
+    # Tests are independent and mostly wait on subprocesses: run them in a
+    # process pool (isolated, unlike threads) and report in the usual order.
+    with tempfile.TemporaryDirectory(prefix="inav_tests_") as tmp_root, \
+            concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(6, os.cpu_count() or 1),
+                initializer=_set_standalone_tmp, initargs=(tmp_root,)) as pool:
+        futures = [pool.submit(_run_standalone, *item) for item in test_items]
+        concurrent.futures.wait(futures)
+
+    counts = {"+": 0, "~": 0, "X": 0}
     current_class = ""
-    for full_name, cls, method_name in test_items:
-        class_name = full_name.split(".")[0]
+    for (class_name, method_name), future in zip(test_items, futures):
         if class_name != current_class:
             current_class = class_name
             print(f"\n-- {class_name} --")
         try:
-            import inspect
-            method = getattr(cls(), method_name)
-            sig = inspect.signature(method)
-            params = [p for p in sig.parameters if p != "self"]
-            if params:
-                skipped += 1
-                print(f"  ~ {method_name} (parametrized, use pytest)")
-                continue
-            method()
-            passed += 1
-            print(f"  + {method_name}")
-        except (SystemExit,):
-            skipped += 1
-            print(f"  ~ {method_name} (skipped)")
+            status, detail = future.result()
         except Exception as e:
-            failed += 1
+            status, detail = "X", str(e)
+        counts[status] += 1
+        if status == "+":
+            print(f"  + {method_name}")
+        elif status == "~":
+            print(f"  ~ {method_name} ({detail})")
+        else:
             print(f"  X {method_name}")
-            print(f"    {e}")
+            print(f"    {detail}")
+    passed, skipped, failed = counts["+"], counts["~"], counts["X"]
 
     print(f"\n{'=' * 60}")
     if failed == 0: